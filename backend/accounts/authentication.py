@@ -0,0 +1,162 @@
+# backend/accounts/authentication.py
+#
+# Stateless JWT authentication for hot endpoints (chat polls, /predict/).
+# Opt-in: off unless AUTH_STATELESS_JWT = True.
+#
+# Access tokens carry role / is_staff / username claims (added at login,
+# Google login and refresh). StatelessJWTAuthentication builds request.user
+# from those claims instead of loading accounts.User on every request.
+#
+# To keep deactivation and role changes effective, each process keeps a
+# short-TTL cache of (is_active, role, is_staff) per user id: at most one
+# small query per user per AUTH_USER_STATE_TTL seconds, and a saved User
+# evicts its own entry immediately in this process.
+
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+User = get_user_model()
+
+CLAIM_FIELDS = ('role', 'is_staff', 'username')
+
+
+def add_user_claims(token, user):
+    """Stamp the claims StatelessJWTAuthentication trusts onto a token."""
+    token['role'] = user.role
+    token['is_staff'] = user.is_staff
+    token['username'] = user.username
+    return token
+
+
+def tokens_for_user(user):
+    """(refresh, access) pair with user claims; access inherits them from refresh."""
+    refresh = add_user_claims(RefreshToken.for_user(user), user)
+    return refresh, refresh.access_token
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Email/password login (TokenObtainPairView) with user claims in the tokens."""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh re-reads the user, so a new access token never carries stale claims."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data['access'])
+        user = User.objects.filter(pk=access[api_settings.USER_ID_CLAIM]).first()
+        if user is not None:
+            data['access'] = str(add_user_claims(access, user))
+        return data
+
+
+# ==========================================
+# Per-process user state cache
+# ==========================================
+
+class UserStateCache:
+    def __init__(self, ttl_seconds=None, max_entries=50000):
+        self._ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}  # user_id -> (expires_at, state or None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl_seconds(self):
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return getattr(settings, 'AUTH_USER_STATE_TTL', 30)
+
+    def get(self, user_id):
+        """{'is_active', 'role', 'is_staff'} for the user, or None if it no longer exists."""
+        # Token claims hold the id as a string; model instances as an int
+        user_id = str(user_id)
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        state = User.objects.filter(pk=user_id).values('is_active', 'role', 'is_staff').first()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[user_id] = (now + self.ttl_seconds, state)
+        return state
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+user_state_cache = UserStateCache()
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    request.user is a simplejwt TokenUser built from the token claims
+    (.id, .username, .is_staff, .role). Tokens whose claims no longer match
+    the user are rejected so the client logs in (or refreshes) again;
+    tokens issued before claims were added fall back to a DB lookup.
+
+    Opt-in with AUTH_STATELESS_JWT = True; by default (False) it does the
+    normal per-request lookup.
+    """
+
+    def get_user(self, validated_token):
+        # Disabled, or a token issued before claims existed: normal DB lookup
+        if not getattr(settings, 'AUTH_STATELESS_JWT', False) or any(
+            claim not in validated_token for claim in CLAIM_FIELDS
+        ):
+            return JWTAuthentication.get_user(self, validated_token)
+
+        user = super().get_user(validated_token)
+
+        state = user_state_cache.get(user.id)
+        if state is None:
+            raise AuthenticationFailed("User not found", code='user_not_found')
+        if not state['is_active']:
+            raise AuthenticationFailed("User is inactive", code='user_inactive')
+        if state['role'] != validated_token['role'] or state['is_staff'] != validated_token['is_staff']:
+            raise AuthenticationFailed("Token claims are out of date; please log in again.", code='token_claims_stale')
+        return user
+
+
+def user_from_claims(user):
+    """
+    A User instance usable as a ForeignKey value without a query: the real
+    one if request.user already is a User, otherwise built from the claims.
+    """
+    if isinstance(user, User):
+        return user
+    instance = User(
+        pk=User._meta.pk.to_python(user.id),
+        username=user.username,
+        role=user.role or 'USER',
+        is_staff=bool(user.is_staff),
+    )
+    instance._state.adding = False
+    return instance
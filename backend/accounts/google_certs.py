@@ -0,0 +1,185 @@
+# backend/accounts/google_certs.py
+#
+# Google ID token verification against a process-local copy of Google's
+# signing certificates.
+#
+# id_token.verify_oauth2_token(..., google_requests.Request()) downloads the
+# certs with a fresh HTTP session on every call. Here the certs are fetched
+# through one pooled requests.Session, kept until the Cache-Control max-age
+# Google sends runs out, and every token is verified offline with
+# google.auth.jwt. If a refresh fails (Google/network outage) the last good
+# certs keep being used, so logins do not break with it.
+#
+# GOOGLE_CERTS_URL (and GOOGLE_ISSUERS) can point at any endpoint serving
+# {kid: PEM certificate}, e.g. a local stub issuer in development.
+
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+from requests.adapters import HTTPAdapter
+
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/oauth2/v1/certs'
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+class CertFetchError(Exception):
+    pass
+
+
+class InvalidGoogleToken(Exception):
+    pass
+
+
+def parse_max_age(cache_control, default):
+    match = MAX_AGE.search(cache_control or '')
+    return int(match.group(1)) if match else default
+
+
+class GoogleCertCache:
+    def __init__(self, url=None, timeout=None, default_ttl=None, min_refetch_seconds=None):
+        self._url = url
+        self._timeout = timeout
+        self._default_ttl = default_ttl
+        self._min_refetch = min_refetch_seconds
+        self._session = None
+        self._certs = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.stale_served = 0
+        self.last_error = None
+
+    # --- Configuration ---
+
+    @property
+    def url(self):
+        return self._url or getattr(settings, 'GOOGLE_CERTS_URL', GOOGLE_CERTS_URL)
+
+    @property
+    def timeout(self):
+        return self._timeout or getattr(settings, 'GOOGLE_CERTS_TIMEOUT', 5)
+
+    @property
+    def default_ttl(self):
+        # Used when the response carries no max-age
+        return self._default_ttl or getattr(settings, 'GOOGLE_CERTS_DEFAULT_TTL', 3600)
+
+    @property
+    def min_refetch_seconds(self):
+        # Unknown `kid` forces a refetch, but not more often than this
+        return self._min_refetch or getattr(settings, 'GOOGLE_CERTS_MIN_REFETCH_SECONDS', 60)
+
+    def _get_session(self):
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=1)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+
+    # --- Fetching ---
+
+    def _fetch(self):
+        """Download the certs; caller holds the lock."""
+        self.fetches += 1
+        try:
+            response = self._get_session().get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            certs = response.json()
+            if not isinstance(certs, dict) or not certs:
+                raise CertFetchError("Certificate response is not a {kid: cert} object")
+        except (requests.RequestException, ValueError, CertFetchError) as e:
+            self.fetch_errors += 1
+            self.last_error = str(e)
+            raise CertFetchError(str(e)) from e
+
+        now = time.monotonic()
+        self._certs = certs
+        self._fetched_at = now
+        self._expires_at = now + parse_max_age(response.headers.get('Cache-Control'), self.default_ttl)
+        self.last_error = None
+
+    def get_certs(self, force=False):
+        """Cached {kid: PEM} dict; refreshed when expired (or forced and not refetched too recently)."""
+        now = time.monotonic()
+        if self._certs and not force and now < self._expires_at:
+            return self._certs
+
+        with self._lock:
+            now = time.monotonic()
+            fresh = self._certs and now < self._expires_at
+            recently = now - self._fetched_at < self.min_refetch_seconds
+            if fresh and (not force or recently):
+                return self._certs
+            try:
+                self._fetch()
+            except CertFetchError as e:
+                if not self._certs:
+                    raise
+                # Outage: keep verifying with the last good keys, and back off
+                # so every login does not wait on a dead endpoint
+                self.stale_served += 1
+                self._fetched_at = now
+                self._expires_at = now + self.min_refetch_seconds
+                print("Google Certs Error (serving cached certs):", e)
+            return self._certs
+
+    # --- Verification ---
+
+    def verify(self, token, audience=None, clock_skew_in_seconds=10):
+        """
+        Verify signature, expiry, audience and issuer offline.
+        Returns the token's claims; raises InvalidGoogleToken.
+        """
+        audience = audience or getattr(settings, 'GOOGLE_CLIENT_ID', None)
+        if not audience:
+            # google.auth skips the audience check for audience=None, which
+            # would accept tokens issued to any app; fail closed instead
+            raise InvalidGoogleToken("GOOGLE_CLIENT_ID is not configured")
+        try:
+            kid = google_jwt.decode_header(token).get('kid')
+            certs = self.get_certs()
+            if kid is not None and kid not in certs:
+                # Google rotated its keys before our copy expired
+                certs = self.get_certs(force=True)
+            claims = google_jwt.decode(
+                token, certs=certs, audience=audience, clock_skew_in_seconds=clock_skew_in_seconds,
+            )
+        except CertFetchError as e:
+            raise InvalidGoogleToken(f"Certificates unavailable: {e}") from e
+        except (ValueError, google_exceptions.GoogleAuthError) as e:
+            raise InvalidGoogleToken(str(e)) from e
+
+        if claims.get('iss') not in getattr(settings, 'GOOGLE_ISSUERS', GOOGLE_ISSUERS):
+            raise InvalidGoogleToken("Wrong issuer")
+        return claims
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            "url": self.url,
+            "keys": len(self._certs),
+            "expires_in": round(self._expires_at - now, 1) if self._certs else None,
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+            "stale_served": self.stale_served,
+            "last_error": self.last_error,
+        }
+
+
+google_certs = GoogleCertCache()
+
+
+def verify_google_id_token(token, audience=None):
+    return google_certs.verify(token, audience=audience)
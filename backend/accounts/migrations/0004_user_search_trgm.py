@@ -0,0 +1,40 @@
+# Trigram indexes for the admin user search (username/email icontains).
+# PostgreSQL only; other databases skip this migration's SQL.
+
+from django.db import migrations
+
+# Django compiles `field__icontains` on PostgreSQL to UPPER("col"::text) LIKE UPPER(...),
+# so the index has to be on that exact expression to be usable.
+INDEXES = {
+    'accounts_user_username_trgm': 'username',
+    'accounts_user_email_trgm': 'email',
+}
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON accounts_user '
+            f'USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_joined_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
@@ -37,5 +37,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    class Meta:
+        indexes = [
+            # Keyset pagination for the admin user list (newest first)
+            models.Index(fields=["-date_joined", "-id"], name="user_joined_id_idx"),
+        ]
+
     def __str__(self):
         return self.email
@@ -1,6 +1,8 @@
 from rest_framework.permissions import BasePermission
 
 class IsAdminRole(BasePermission):
+    # Works with a real User or a claims-backed TokenUser
+    # (accounts.authentication.StatelessJWTAuthentication): role is a token claim there.
     def has_permission(self, request, view):
         return bool(
             request.user and request.user.is_authenticated and request.user.role == 'ADMIN'
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_state_cache
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_user_state(sender, instance, **kwargs):
+    # Deactivation / role change takes effect at once in this process,
+    # and within AUTH_USER_STATE_TTL in the others
+    user_state_cache.evict(instance.pk)
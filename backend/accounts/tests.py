@@ -0,0 +1,215 @@
+import datetime
+import time
+from unittest import mock
+
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.test import SimpleTestCase, TestCase, override_settings
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import StatelessJWTAuthentication, tokens_for_user, user_from_claims, user_state_cache
+from .google_certs import GoogleCertCache, InvalidGoogleToken
+from .models import User
+
+CLIENT_ID = 'test-client.apps.googleusercontent.com'
+ISSUER = 'https://accounts.google.com'
+
+
+def make_key(kid):
+    """(signer, PEM certificate) for a throwaway RSA key, like one of Google's."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'stub-issuer')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    pem_key = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    )
+    signer = crypt.RSASigner.from_string(pem_key, key_id=kid)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class StubIssuer:
+    """Stands in for the requests.Session talking to Google's certs endpoint."""
+
+    def __init__(self, certs, max_age=300):
+        self.certs = certs
+        self.max_age = max_age
+        self.down = False
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        if self.down:
+            raise requests.ConnectionError("stub issuer is down")
+        response = mock.Mock()
+        response.json.return_value = dict(self.certs)
+        response.headers = {'Cache-Control': f'public, max-age={self.max_age}'}
+        response.raise_for_status.return_value = None
+        return response
+
+
+@override_settings(GOOGLE_CLIENT_ID=CLIENT_ID, GOOGLE_ISSUERS=(ISSUER,))
+class GoogleCertCacheTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.signer, cls.cert = make_key('key-1')
+        cls.rotated_signer, cls.rotated_cert = make_key('key-2')
+
+    def setUp(self):
+        self.issuer = StubIssuer({'key-1': self.cert})
+        self.cache = GoogleCertCache(url='https://stub.invalid/certs', min_refetch_seconds=60)
+        self.cache._session = self.issuer
+        self.now = 1000.0
+        patcher = mock.patch('accounts.google_certs.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def token(self, signer=None, **claims):
+        issued = int(time.time())
+        payload = {
+            'iss': ISSUER, 'aud': CLIENT_ID, 'sub': '42', 'email': 'student@example.com',
+            'iat': issued, 'exp': issued + 600, **claims,
+        }
+        return google_jwt.encode(signer or self.signer, payload).decode()
+
+    def test_certs_reused_until_max_age_then_refetched(self):
+        self.cache.verify(self.token())
+        self.now += 299
+        self.cache.verify(self.token())
+        self.assertEqual(self.issuer.calls, 1)
+
+        self.now += 2
+        self.assertEqual(self.cache.verify(self.token())['sub'], '42')
+        self.assertEqual(self.issuer.calls, 2)
+
+    def test_stale_certs_served_during_outage(self):
+        self.cache.verify(self.token())
+        self.issuer.down = True
+        self.now += 301
+
+        self.assertEqual(self.cache.verify(self.token())['sub'], '42')
+        self.assertEqual(self.cache.stale_served, 1)
+        # Backs off instead of hitting the dead endpoint on every login
+        self.cache.verify(self.token())
+        self.assertEqual(self.issuer.calls, 2)
+
+    def test_no_certs_at_all_is_rejected(self):
+        self.issuer.down = True
+        with self.assertRaises(InvalidGoogleToken):
+            self.cache.verify(self.token())
+
+    def test_unknown_kid_refetches_after_rotation(self):
+        self.cache.verify(self.token())
+        self.issuer.certs = {'key-1': self.cert, 'key-2': self.rotated_cert}
+        self.now += 120  # still inside max-age, past min_refetch_seconds
+
+        claims = self.cache.verify(self.token(signer=self.rotated_signer))
+        self.assertEqual(claims['sub'], '42')
+        self.assertEqual(self.issuer.calls, 2)
+
+    def test_unknown_kid_refetch_is_rate_limited(self):
+        self.cache.verify(self.token())
+        with self.assertRaises(InvalidGoogleToken):
+            self.cache.verify(self.token(signer=self.rotated_signer))
+        self.assertEqual(self.issuer.calls, 1)
+
+    def test_wrong_audience_rejected(self):
+        with self.assertRaises(InvalidGoogleToken):
+            self.cache.verify(self.token(aud='someone-else.apps.googleusercontent.com'))
+
+    def test_wrong_issuer_rejected(self):
+        with self.assertRaises(InvalidGoogleToken):
+            self.cache.verify(self.token(iss='https://evil.example.com'))
+
+    @override_settings(GOOGLE_CLIENT_ID='')
+    def test_missing_client_id_fails_closed(self):
+        with self.assertRaises(InvalidGoogleToken):
+            self.cache.verify(self.token())
+        self.assertEqual(self.issuer.calls, 0)
+
+
+@override_settings(AUTH_STATELESS_JWT=True)
+class StatelessJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='s@example.com', username='student', password='x')
+        self.auth = StatelessJWTAuthentication()
+        self.addCleanup(user_state_cache.evict, self.user.pk)
+
+    def authenticate(self, token):
+        return self.auth.get_user(self.auth.get_validated_token(str(token)))
+
+    def access_token(self):
+        return tokens_for_user(self.user)[1]
+
+    def test_user_built_from_claims(self):
+        with self.assertNumQueries(1):  # user state, then cached
+            user = self.authenticate(self.access_token())
+            self.authenticate(self.access_token())
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual((str(user.id), user.username, user.role), (str(self.user.pk), 'student', 'USER'))
+
+    def test_deactivated_user_rejected(self):
+        token = self.access_token()
+        self.authenticate(token)
+        self.user.is_active = False
+        self.user.save()  # evicts the cached state
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    @override_settings(AUTH_USER_STATE_TTL=0)
+    def test_deactivation_in_another_process_seen_after_ttl(self):
+        token = self.access_token()
+        self.authenticate(token)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)  # no signal, like another worker
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_role_change_rejects_old_token(self):
+        old = self.access_token()
+        self.user.role = 'ADMIN'
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(old)
+        self.assertEqual(self.authenticate(self.access_token()).role, 'ADMIN')
+
+    def test_missing_user_id_claim_rejected(self):
+        token = self.access_token()
+        del token[api_settings.USER_ID_CLAIM]
+        with self.assertRaises(InvalidToken):
+            self.authenticate(token)
+
+    def test_token_without_claims_falls_back_to_lookup(self):
+        self.assertEqual(self.authenticate(AccessToken.for_user(self.user)), self.user)
+
+    @override_settings(AUTH_STATELESS_JWT=False)
+    def test_off_loads_the_real_user(self):
+        self.assertEqual(self.authenticate(self.access_token()), self.user)
+
+    def test_user_from_claims(self):
+        claims_user = self.authenticate(self.access_token())
+        with self.assertNumQueries(0):
+            instance = user_from_claims(claims_user)
+        self.assertIsInstance(instance, User)
+        self.assertEqual((instance.pk, instance.username, instance.role), (self.user.pk, 'student', 'USER'))
+        self.assertFalse(instance._state.adding)
+        self.assertIs(user_from_claims(self.user), self.user)
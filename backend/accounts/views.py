@@ -7,11 +7,8 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from rest_framework_simplejwt.tokens import RefreshToken
-
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-
+from .authentication import tokens_for_user
+from .google_certs import InvalidGoogleToken, verify_google_id_token
 from .models import User
 from .serializers import RegisterSerializer, UserSerializer
 
@@ -46,19 +43,13 @@ class GoogleLoginView(APIView):
             )
 
         try:
-            # Verify token with Google
-            idinfo = id_token.verify_oauth2_token(
+            # Verify offline against cached Google certs (accounts/google_certs.py)
+            idinfo = verify_google_id_token(
                 token,
-                google_requests.Request(),
                 settings.GOOGLE_CLIENT_ID,   # settings.py lo set chesam
             )
-            if idinfo["iss"] not in [
-                "accounts.google.com",
-                "https://accounts.google.com",
-            ]:
-                raise ValueError("Wrong issuer")
 
-        except Exception:
+        except InvalidGoogleToken:
             return Response(
                 {"detail": "Invalid Google token"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -84,12 +75,12 @@ class GoogleLoginView(APIView):
             user.is_active = True
             user.save()
 
-        # Issue JWT tokens
-        refresh = RefreshToken.for_user(user)
+        # Issue JWT tokens (with role/is_staff/username claims)
+        refresh, access = tokens_for_user(user)
 
         return Response(
             {
-                "access": str(refresh.access_token),
+                "access": str(access),
                 "refresh": str(refresh),
                 "user": {
                     "id": user.id,
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from adminpanel.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the admin analytics rollups (RollupTotal / DailyRollup) from "
+        "JobPrediction, UserProfile, User and TrainingData. Migration 0003 does this once; "
+        "run it again any time rows were changed behind the ORM's back."
+    )
+
+    def handle(self, *args, **options):
+        result = rebuild_rollups(stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {result['totals']} total and {result['daily']} daily rollup rows."
+        ))
@@ -0,0 +1,33 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from adminpanel.timeseries import rebuild_buckets
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute hour/day PredictionBucket rows from JobPrediction. "
+        "With --start/--end only the days in that range are replaced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="First day to rebuild (YYYY-MM-DD)")
+        parser.add_argument('--end', help="Last day to rebuild, inclusive (YYYY-MM-DD)")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def _day(self, value):
+        if not value:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"Not a date: {value}")
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def handle(self, *args, **options):
+        start, end = self._day(options['start']), self._day(options['end'])
+        written = rebuild_buckets(start=start, end=end, chunk_size=options['chunk_size'])
+        scope = f"{options['start'] or 'beginning'} .. {options['end'] or 'now'}"
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} prediction buckets ({scope})."))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('predictions', 'Predictions (all roles)'), ('role', 'Predictions per role'), ('degree', 'Student profiles per degree'), ('students', 'Student accounts'), ('training_role', 'Training rows per role'), ('training_degree', 'Training rows per degree')], max_length=20)),
+                ('day', models.DateField()),
+                ('key', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'day', 'key'), name='unique_daily_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('predictions', 'Predictions (all roles)'), ('role', 'Predictions per role'), ('degree', 'Student profiles per degree'), ('students', 'Student accounts'), ('training_role', 'Training rows per role'), ('training_degree', 'Training rows per degree')], max_length=20)),
+                ('key', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metric', '-count'], name='rollup_total_top_idx')],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='unique_rollup_total')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket_start', models.DateTimeField()),
+                ('role', models.CharField(max_length=100)),
+                ('branch', models.CharField(blank=True, default='', max_length=100)),
+                ('confidence_bin', models.PositiveSmallIntegerField()),
+                ('count', models.BigIntegerField(default=0)),
+                ('confidence_sum', models.FloatField(default=0.0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['granularity', 'bucket_start', 'role'], name='predbucket_range_role_idx')],
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket_start', 'role', 'branch', 'confidence_bin'), name='unique_prediction_bucket')],
+            },
+        ),
+    ]
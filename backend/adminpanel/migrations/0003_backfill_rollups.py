@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    # Rows that existed before the rollup tables were added; after this the
+    # signals keep them current
+    from adminpanel.rollups import rebuild_rollups
+    rebuild_rollups(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0002_predictionbucket'),
+        ('predictions', '0009_retrainjob_streaming_mode'),
+        ('profiles', '0004_userprofile_search_trgm'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
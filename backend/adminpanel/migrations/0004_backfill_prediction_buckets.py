@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    # Predictions made before the bucket table existed; after this the
+    # signals keep it current
+    from adminpanel.timeseries import rebuild_buckets
+    rebuild_buckets(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0003_backfill_rollups'),
+        ('predictions', '0009_retrainjob_streaming_mode'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,94 @@
+from django.db import models
+
+
+# ==========================================
+# ANALYTICS ROLLUPS
+# ==========================================
+# Precomputed counts for the admin dashboard, maintained incrementally by
+# adminpanel/signals.py and rebuilt from scratch by
+# `python manage.py rebuild_analytics_rollups`.
+
+class RollupMetric(models.TextChoices):
+    PREDICTIONS = 'predictions', 'Predictions (all roles)'
+    ROLE = 'role', 'Predictions per role'
+    DEGREE = 'degree', 'Student profiles per degree'
+    STUDENTS = 'students', 'Student accounts'
+    TRAINING_ROLE = 'training_role', 'Training rows per role'
+    TRAINING_DEGREE = 'training_degree', 'Training rows per degree'
+
+
+class RollupTotal(models.Model):
+    """All-time count per (metric, key). The dashboard reads only this table."""
+    metric = models.CharField(max_length=20, choices=RollupMetric.choices)
+    key = models.CharField(max_length=100, blank=True, default='')
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'key'], name='unique_rollup_total'),
+        ]
+        indexes = [
+            models.Index(fields=['metric', '-count'], name='rollup_total_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}:{self.key} = {self.count}"
+
+
+class DailyRollup(models.Model):
+    """
+    Per-day change per (metric, key): predictions made that day, or the net
+    change in profiles holding a degree that day (can be negative).
+    """
+    metric = models.CharField(max_length=20, choices=RollupMetric.choices)
+    day = models.DateField()
+    key = models.CharField(max_length=100, blank=True, default='')
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'day', 'key'], name='unique_daily_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}:{self.day}:{self.key} = {self.count}"
+
+
+# ==========================================
+# PREDICTION TIME SERIES
+# ==========================================
+# One row per (granularity, bucket, role, branch, confidence bin), kept
+# current by adminpanel/timeseries.py. A range query reads only the buckets
+# inside the range, never JobPrediction itself.
+
+class PredictionBucket(models.Model):
+    HOUR = 'hour'
+    DAY = 'day'
+    GRANULARITY_CHOICES = (
+        (HOUR, 'Hour'),
+        (DAY, 'Day'),
+    )
+
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    role = models.CharField(max_length=100)
+    branch = models.CharField(max_length=100, blank=True, default='')
+    # confidence_score // CONFIDENCE_BIN_WIDTH, i.e. 0 = [0, 10%), ..., 9 = [90, 100%]
+    confidence_bin = models.PositiveSmallIntegerField()
+
+    count = models.BigIntegerField(default=0)
+    confidence_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket_start', 'role', 'branch', 'confidence_bin'],
+                name='unique_prediction_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start', 'role'], name='predbucket_range_role_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket_start:%Y-%m-%d %H:%M} {self.role}/{self.branch} bin {self.confidence_bin}: {self.count}"
@@ -0,0 +1,127 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from predictions.models import JobPrediction, TrainingData
+from predictions.signals import bulk_created
+from profiles.models import UserProfile
+
+from . import rollups, timeseries
+
+User = get_user_model()
+
+
+# --- A. Predictions ---
+
+@receiver(post_save, sender=JobPrediction)
+def prediction_saved(sender, instance, created, **kwargs):
+    if created:
+        rollups.record_predictions([instance])
+        timeseries.record_predictions([instance])
+
+
+@receiver(post_delete, sender=JobPrediction)
+def prediction_deleted(sender, instance, **kwargs):
+    rollups.record_predictions([instance], sign=-1)
+    timeseries.record_predictions([instance], sign=-1)
+
+
+@receiver(bulk_created, sender=JobPrediction)
+def predictions_bulk_created(sender, objs=(), **kwargs):
+    # Write-behind flushes and /predict/batch/ use bulk_create (no post_save)
+    rollups.record_predictions(objs)
+    timeseries.record_predictions(objs)
+
+
+# --- B. Training data ---
+# CSV ingestion uses bulk_create (bulk_created signal); admin and ORM
+# create/edit/delete go through the save/delete signals below.
+# pre_save remembers what the row held; post_save applies the difference.
+
+def _skipped(instance, raw, update_fields, field):
+    """New rows, fixtures, and save(update_fields=...) that leave `field` alone."""
+    return raw or instance.pk is None or (update_fields is not None and field not in update_fields)
+
+
+@receiver(bulk_created, sender=TrainingData)
+def training_rows_bulk_created(sender, frame=None, **kwargs):
+    if frame is not None and len(frame):
+        rollups.record_training_rows(frame)
+
+
+@receiver(pre_save, sender=TrainingData)
+def remember_old_training_row(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        instance._rollup_old_row = None
+    elif update_fields is not None and not {'degree', 'job_role'} & set(update_fields):
+        instance._rollup_old_row = (instance.degree, instance.job_role)
+    else:
+        instance._rollup_old_row = (
+            TrainingData.objects.filter(pk=instance.pk).values_list('degree', 'job_role').first()
+        )
+
+
+@receiver(post_save, sender=TrainingData)
+def training_row_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old, new = getattr(instance, '_rollup_old_row', None), (instance.degree, instance.job_role)
+    if old != new:
+        rollups.record_training_change(old, new)
+
+
+@receiver(post_delete, sender=TrainingData)
+def training_row_deleted(sender, instance, **kwargs):
+    rollups.record_training_change((instance.degree, instance.job_role), None)
+
+
+# --- C. Profiles (degree distribution) ---
+
+
+@receiver(pre_save, sender=UserProfile)
+def remember_old_degree(sender, instance, raw=False, update_fields=None, **kwargs):
+    if _skipped(instance, raw, update_fields, 'highest_degree'):
+        # Unchanged degree on a partial save; unknown (i.e. none) on a new row
+        instance._rollup_old_degree = None if instance.pk is None or raw else instance.highest_degree
+        return
+    instance._rollup_old_degree = (
+        UserProfile.objects.filter(pk=instance.pk).values_list('highest_degree', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        rollups.record_degree_change(getattr(instance, '_rollup_old_degree', None), instance.highest_degree)
+
+
+@receiver(post_delete, sender=UserProfile)
+def profile_deleted(sender, instance, **kwargs):
+    rollups.record_degree_change(instance.highest_degree, None)
+
+
+# --- D. Student accounts ---
+
+@receiver(pre_save, sender=User)
+def remember_old_staff_flag(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins save(update_fields=['last_login']); no lookup needed for those
+    if _skipped(instance, raw, update_fields, 'is_staff'):
+        instance._rollup_was_staff = None if instance.pk is None or raw else instance.is_staff
+        return
+    instance._rollup_was_staff = User.objects.filter(pk=instance.pk).values_list('is_staff', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    was_student = not created and getattr(instance, '_rollup_was_staff', None) is False
+    is_student = not instance.is_staff
+    if is_student != was_student:
+        rollups.record_student_change(1 if is_student else -1)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    if not instance.is_staff:
+        rollups.record_student_change(-1)
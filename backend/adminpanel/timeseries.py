@@ -0,0 +1,177 @@
+# backend/adminpanel/timeseries.py
+#
+# Hour/day buckets of predictions by role, branch and confidence bin.
+#
+# Writers (adminpanel/signals.py) fold each batch of predictions into
+# per-bucket deltas and apply one F() upsert per touched bucket. Readers
+# filter on (granularity, bucket_start range) and GROUP BY whichever
+# dimensions they want, so cost scales with buckets in range, not rows.
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import PredictionBucket
+
+CONFIDENCE_BIN_WIDTH = 10   # confidence_score is a percentage
+CONFIDENCE_BINS = 10        # 0..9; a score of exactly 100 goes in the top bin
+
+GRANULARITIES = (PredictionBucket.HOUR, PredictionBucket.DAY)
+DIMENSIONS = ('role', 'branch', 'confidence_bin')
+
+# CharField limit on PredictionBucket.role / branch
+KEY_LENGTH = 100
+
+
+def _key(value):
+    return str(value or '').strip()[:KEY_LENGTH]
+
+
+def confidence_bin(score):
+    score = float(score or 0.0)
+    return min(max(int(score // CONFIDENCE_BIN_WIDTH), 0), CONFIDENCE_BINS - 1)
+
+
+def bucket_start(moment, granularity):
+    """Start of the hour/day (local time) containing `moment`, as an aware datetime."""
+    local = timezone.localtime(moment)
+    if granularity == PredictionBucket.DAY:
+        local = local.replace(hour=0)
+    return local.replace(minute=0, second=0, microsecond=0)
+
+
+def fold(rows, sign=1):
+    """
+    rows: iterable of (created_at, role, branch, confidence_score)
+    -> {(granularity, bucket_start, role, branch, bin): [count, confidence_sum]}
+    """
+    deltas = defaultdict(lambda: [0, 0.0])
+    for created_at, role, branch, score in rows:
+        dims = (_key(role), _key(branch), confidence_bin(score))
+        for granularity in GRANULARITIES:
+            entry = deltas[(granularity, bucket_start(created_at, granularity)) + dims]
+            entry[0] += sign
+            entry[1] += sign * float(score or 0.0)
+    return deltas
+
+
+def _bump(lookup, count, confidence_sum):
+    changes = {'count': F('count') + count, 'confidence_sum': F('confidence_sum') + confidence_sum}
+    if PredictionBucket.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            PredictionBucket.objects.create(count=count, confidence_sum=confidence_sum, **lookup)
+    except IntegrityError:
+        # Another writer created the bucket between our UPDATE and INSERT
+        PredictionBucket.objects.filter(**lookup).update(**changes)
+
+
+def apply(deltas):
+    with transaction.atomic():
+        # Sorted so concurrent writers lock buckets in the same order
+        for (granularity, start, role, branch, bin_), (count, confidence_sum) in sorted(deltas.items()):
+            if count:
+                _bump(
+                    {'granularity': granularity, 'bucket_start': start, 'role': role,
+                     'branch': branch, 'confidence_bin': bin_},
+                    count, confidence_sum,
+                )
+
+
+def record_predictions(predictions, sign=1):
+    """JobPrediction instances saved (sign=1) or deleted (sign=-1)."""
+    now = timezone.now()
+    apply(fold(
+        ((p.created_at or now, p.predicted_role, p.branch, p.confidence_score) for p in predictions),
+        sign=sign,
+    ))
+
+
+# --- Backfill ---
+
+def rebuild_buckets(start=None, end=None, chunk_size=5000, apps=None):
+    """
+    Recompute buckets from JobPrediction, either entirely or for the days
+    touched by [start, end). Uses the (created_at, predicted_role) index and
+    streams rows, so memory is bounded by the number of buckets.
+    Data migrations pass their `apps` so the historical models are used.
+    Returns the number of bucket rows written.
+    """
+    if apps is None:
+        from django.apps import apps
+    JobPrediction = apps.get_model('predictions', 'JobPrediction')
+    Bucket = apps.get_model('adminpanel', 'PredictionBucket')
+
+    predictions = JobPrediction.objects.all()
+    buckets = Bucket.objects.all()
+    if start is not None:
+        start = bucket_start(start, PredictionBucket.DAY)
+        predictions = predictions.filter(created_at__gte=start)
+        buckets = buckets.filter(bucket_start__gte=start)
+    if end is not None:
+        end = bucket_start(end, PredictionBucket.DAY) + timedelta(days=1)
+        predictions = predictions.filter(created_at__lt=end)
+        buckets = buckets.filter(bucket_start__lt=end)
+
+    rows = predictions.order_by().values_list('created_at', 'predicted_role', 'branch', 'confidence_score')
+    deltas = fold(rows.iterator(chunk_size=chunk_size))
+
+    with transaction.atomic():
+        buckets.delete()
+        Bucket.objects.bulk_create(
+            [
+                Bucket(granularity=g, bucket_start=s, role=r, branch=b, confidence_bin=c,
+                       count=count, confidence_sum=total)
+                for (g, s, r, b, c), (count, total) in deltas.items()
+            ],
+            batch_size=1000,
+        )
+    return len(deltas)
+
+
+# --- Range queries ---
+
+def query(start, end, granularity, by=('role',), over_time=True, role=None, branch=None):
+    """
+    Buckets with bucket_start in [start, end), summed over every dimension
+    not listed in `by`. With over_time=False the time axis is summed too
+    (e.g. by=('branch', 'role') gives a branch x role matrix for the range).
+
+    Returns a list of dicts: {bucket_start?, <by dims>..., count, avg_confidence}.
+    """
+    buckets = PredictionBucket.objects.filter(
+        granularity=granularity,
+        bucket_start__gte=bucket_start(start, granularity),
+        bucket_start__lt=end,
+    )
+    if role:
+        buckets = buckets.filter(role=role)
+    if branch:
+        buckets = buckets.filter(branch=branch)
+
+    group_by = (['bucket_start'] if over_time else []) + list(by)
+    rows = (
+        buckets.values(*group_by)
+        .annotate(n=Sum('count'), confidence_total=Sum('confidence_sum'))
+        .filter(n__gt=0)
+        .order_by(*group_by)
+    )
+
+    result = []
+    for row in rows:
+        count = row.pop('n')
+        confidence_total = row.pop('confidence_total')
+        row['count'] = count
+        row['avg_confidence'] = round(confidence_total / count, 2)
+        result.append(row)
+    return result
+
+
+def confidence_bin_label(bin_):
+    low = bin_ * CONFIDENCE_BIN_WIDTH
+    high = low + CONFIDENCE_BIN_WIDTH
+    return f"{low}-{high}%"
@@ -3,7 +3,9 @@ from .views import (
     admin_stats, 
     admin_users_list, 
     update_user_status, 
-    admin_analytics_data
+    admin_analytics_data,
+    admin_prediction_timeseries,
+    admin_db_status
 )
 
 urlpatterns = [
@@ -11,4 +13,6 @@ urlpatterns = [
     path('users/', admin_users_list, name='admin_users_list'),
     path('user/<int:user_id>/status/', update_user_status, name='update_user_status'), # New
     path('analytics-data/', admin_analytics_data, name='admin_analytics_data'), # New
+    path('analytics/timeseries/', admin_prediction_timeseries, name='admin_prediction_timeseries'),
+    path('db/status/', admin_db_status, name='admin_db_status'),
 ]
\ No newline at end of file
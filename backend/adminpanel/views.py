@@ -1,10 +1,21 @@
+import base64
+from datetime import datetime, time, timedelta
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from time import perf_counter
+
+from django.conf import settings
 from django.contrib.auth import get_user_model # <--- IMPORTANT FIX
-from django.db.models import Q, Count
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.db.models import Q
 from profiles.models import UserProfile
-from predictions.models import JobPrediction, TrainingData
+
+from . import rollups, timeseries
+from .models import PredictionBucket, RollupMetric
 
 # Get the active User model (accounts.User)
 User = get_user_model()
@@ -13,8 +24,9 @@ User = get_user_model()
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_stats(request):
-    total_users = User.objects.filter(is_staff=False).count()
-    total_predictions = JobPrediction.objects.count()
+    # Precomputed totals (adminpanel/rollups.py), not COUNT(*) over the tables
+    total_users = rollups.total(RollupMetric.STUDENTS)
+    total_predictions = rollups.total(RollupMetric.PREDICTIONS)
     
     # Get last 5 registered students
     recent_users = User.objects.filter(is_staff=False).order_by('-date_joined')[:5]
@@ -34,9 +46,26 @@ def admin_stats(request):
     })
 
 # 2. ADVANCED USER LIST & FILTER
+USERS_PAGE_SIZE = 50
+USERS_MAX_PAGE_SIZE = 200
+
+def encode_cursor(date_joined, user_id):
+    raw = f"{date_joined.isoformat()}|{user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    joined, user_id = raw.rsplit('|', 1)
+    return datetime.fromisoformat(joined), int(user_id)
+
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_users_list(request):
+    """
+    Keyset-paginated user search: ?cursor=<next_cursor>&limit=50.
+    Ordered by (date_joined, id) newest first, so every page is one index
+    range scan no matter how deep the admin scrolls.
+    """
     # Get Filter Params
     search = request.GET.get('search', '')
     role = request.GET.get('role', '')
@@ -44,9 +73,14 @@ def admin_users_list(request):
     skill = request.GET.get('skill', '')
     min_cgpa = request.GET.get('min_cgpa', 0)
     status = request.GET.get('status', '') 
+    cursor = request.GET.get('cursor', '')
 
-    # Efficient Query: Fetch Users + Profiles in one go
-    users = User.objects.all().select_related('userprofile').order_by('-date_joined')
+    try:
+        limit = min(int(request.GET.get('limit', USERS_PAGE_SIZE)), USERS_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = USERS_PAGE_SIZE
+
+    users = User.objects.order_by('-date_joined', '-id')
 
     # --- FILTER LOGIC ---
     if search:
@@ -70,25 +104,47 @@ def admin_users_list(request):
     if status:
         users = users.filter(userprofile__recruitment_status=status)
 
+    # --- KEYSET PAGINATION ---
+    if cursor:
+        try:
+            joined, last_id = decode_cursor(cursor)
+        except (ValueError, UnicodeDecodeError):
+            return Response({"error": "Invalid cursor"}, status=400)
+        users = users.filter(Q(date_joined__lt=joined) | Q(date_joined=joined, id__lt=last_id))
+
+    # Plain dicts (no model instances); profile columns come from the same LEFT JOIN
+    rows = list(users.values(
+        'id', 'username', 'email', 'is_staff', 'date_joined',
+        'userprofile__college', 'userprofile__highest_degree', 'userprofile__cgpa',
+        'userprofile__skills', 'userprofile__recruitment_status',
+    )[:limit + 1])
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
     # --- DATA FORMATTING ---
     data = []
-    for u in users:
-        # Safely access profile
-        p = getattr(u, 'userprofile', None)
+    for u in rows:
+        has_profile = u['userprofile__recruitment_status'] is not None
         data.append({
-            "id": u.id,
-            "username": u.username,
-            "email": u.email,
-            "role": "Admin" if u.is_staff else "Student",
-            "college": p.college if p else "N/A",
-            "degree": p.highest_degree if p else "N/A",
-            "cgpa": p.cgpa if p else 0,
-            "skills": p.skills if p else "",
-            "status": p.recruitment_status if p else "PENDING",
-            "joined_at": u.date_joined.strftime("%Y-%m-%d")
+            "id": u['id'],
+            "username": u['username'],
+            "email": u['email'],
+            "role": "Admin" if u['is_staff'] else "Student",
+            "college": u['userprofile__college'] if has_profile else "N/A",
+            "degree": u['userprofile__highest_degree'] if has_profile else "N/A",
+            "cgpa": u['userprofile__cgpa'] if has_profile else 0,
+            "skills": u['userprofile__skills'] if has_profile else "",
+            "status": u['userprofile__recruitment_status'] if has_profile else "PENDING",
+            "joined_at": u['date_joined'].strftime("%Y-%m-%d")
         })
-        
-    return Response(data)
+
+    next_cursor = encode_cursor(rows[-1]['date_joined'], rows[-1]['id']) if has_more else None
+    return Response({
+        "results": data,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
 
 # 3. UPDATE USER STATUS
 @api_view(['POST'])
@@ -109,44 +165,161 @@ def update_user_status(request, user_id):
         return Response({"error": "Profile not found"}, status=404)
 
 # 4. ANALYTICS DATA (With Fallback Logic)
+# Everything comes from the rollup tables, so the cost is a few indexed
+# reads no matter how many predictions / profiles exist.
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_analytics_data(request):
     
     # --- A. ROLE DEMAND CHART LOGIC ---
     # Check if we have real predictions
-    real_prediction_count = JobPrediction.objects.count()
-    role_dist = []
+    real_prediction_count = rollups.total(RollupMetric.PREDICTIONS)
     
     if real_prediction_count > 0:
         # Use Real Predictions
-        queryset = JobPrediction.objects.values('predicted_role').annotate(count=Count('id')).order_by('-count')[:10]
-        role_dist = list(queryset)
+        role_dist = [
+            {'predicted_role': role, 'count': count}
+            for role, count in rollups.top(RollupMetric.ROLE, limit=10)
+        ]
     else:
         # Fallback to CSV Training Data
-        queryset = TrainingData.objects.values('job_role').annotate(count=Count('id')).order_by('-count')[:10]
         role_dist = [
-            {'predicted_role': item['job_role'], 'count': item['count']} 
-            for item in queryset
+            {'predicted_role': role, 'count': count}
+            for role, count in rollups.top(RollupMetric.TRAINING_ROLE, limit=10)
         ]
 
     # --- B. DEGREE DISTRIBUTION CHART LOGIC ---
-    real_user_count = UserProfile.objects.exclude(highest_degree__isnull=True).exclude(highest_degree__exact='').count()
-    degree_dist = []
+    degree_dist = [
+        {'highest_degree': degree, 'count': count}
+        for degree, count in rollups.top(RollupMetric.DEGREE)
+    ]
     
-    if real_user_count > 0:
-        # Use Real User Data
-        degree_dist = UserProfile.objects.values('highest_degree').annotate(count=Count('id'))
-    else:
+    if not degree_dist:
         # Fallback to CSV Data
-        queryset = TrainingData.objects.values('degree').annotate(count=Count('id')).order_by('-count')[:6]
         degree_dist = [
-            {'highest_degree': item['degree'], 'count': item['count']}
-            for item in queryset
+            {'highest_degree': degree, 'count': count}
+            for degree, count in rollups.top(RollupMetric.TRAINING_DEGREE, limit=6)
         ]
 
+    # --- C. DAILY PREDICTIONS (last 30 days) ---
+    daily_predictions = [
+        {'day': day.isoformat(), 'count': count}
+        for day, count in rollups.daily_series(RollupMetric.PREDICTIONS, days=30)
+    ]
+
     return Response({
         "degree_distribution": degree_dist,
         "role_demand": role_dist,
+        "daily_predictions": daily_predictions,
         "source": "Real Data" if real_prediction_count > 0 else "Training Dataset (CSV)"
-    })
\ No newline at end of file
+    })
+
+
+# 5. PREDICTION TIME SERIES (range queries over hour/day buckets)
+def _parse_moment(value, end_of_day=False):
+    """'2026-05-01' or an ISO datetime -> aware datetime (None if unparseable)."""
+    day = parse_date(value)
+    if day is not None:
+        moment = datetime.combine(day + timedelta(days=1) if end_of_day else day, time.min)
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_prediction_timeseries(request):
+    """
+    Query params (all optional):
+      start, end   ISO date or datetime; default the last 7 days. A plain
+                   `end` date includes that whole day.
+      granularity  'hour' or 'day'; default hour for ranges up to 3 days.
+      by           comma list of role, branch, confidence_bin (default role)
+      over_time    '0' sums the time axis too, e.g. by=branch,role&over_time=0
+                   is a branch x role matrix for the range.
+      role, branch filter to one value.
+    Reads only PredictionBucket rows inside the range.
+    """
+    try:
+        end = _parse_moment(request.GET['end'], end_of_day=True) if 'end' in request.GET else timezone.now()
+        start = _parse_moment(request.GET['start']) if 'start' in request.GET else end - timedelta(days=7)
+    except ValueError:
+        start = end = None
+    if start is None or end is None or start >= end:
+        return Response({"error": "Invalid start/end"}, status=400)
+
+    span = end - start
+    granularity = request.GET.get('granularity') or (
+        PredictionBucket.HOUR if span <= timedelta(days=3) else PredictionBucket.DAY
+    )
+    if granularity not in timeseries.GRANULARITIES:
+        return Response({"error": "granularity must be 'hour' or 'day'"}, status=400)
+    max_hourly_days = getattr(settings, 'ANALYTICS_MAX_HOURLY_RANGE_DAYS', 31)
+    if granularity == PredictionBucket.HOUR and span > timedelta(days=max_hourly_days):
+        return Response({"error": f"Hourly ranges are limited to {max_hourly_days} days; use granularity=day"}, status=400)
+
+    by = [dim for dim in request.GET.get('by', 'role').split(',') if dim]
+    unknown = [dim for dim in by if dim not in timeseries.DIMENSIONS]
+    if unknown:
+        return Response({"error": f"Unknown dimension(s): {', '.join(unknown)}"}, status=400)
+    over_time = request.GET.get('over_time', '1') not in ('0', 'false')
+
+    rows = timeseries.query(
+        start, end, granularity, by=by, over_time=over_time,
+        role=request.GET.get('role'), branch=request.GET.get('branch'),
+    )
+    for row in rows:
+        if 'bucket_start' in row:
+            row['bucket_start'] = timezone.localtime(row['bucket_start']).isoformat()
+        if 'confidence_bin' in row:
+            row['confidence_range'] = timeseries.confidence_bin_label(row['confidence_bin'])
+
+    return Response({
+        "start": timezone.localtime(start).isoformat(),
+        "end": timezone.localtime(end).isoformat(),
+        "granularity": granularity,
+        "by": by,
+        "over_time": over_time,
+        "results": rows,
+    })
+
+
+# 6. DATABASE CONNECTION / POOL STATUS
+def _connection_status(alias):
+    conn = connections[alias]
+    config = conn.settings_dict
+    status = {
+        "vendor": conn.vendor,
+        "host": config.get('HOST') or None,
+        "name": str(config.get('NAME')),
+        "conn_max_age": config.get('CONN_MAX_AGE'),
+        "health_checks": config.get('CONN_HEALTH_CHECKS'),
+        "pooled": bool(config.get('OPTIONS', {}).get('pool')),
+        # True when this worker thread is reusing a connection from an earlier request
+        "connection_open": conn.connection is not None,
+    }
+
+    started = perf_counter()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        status["ping_ms"] = round((perf_counter() - started) * 1000, 2)
+    except Exception as e:
+        status["error"] = str(e)
+
+    pool = getattr(conn, 'pool', None)
+    if pool is not None:
+        status["pool"] = pool.get_stats()
+    return status
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_db_status(request):
+    """Per-alias connection settings, a SELECT 1 round trip, and psycopg pool stats when pooling."""
+    return Response({
+        "routers": settings.DATABASE_ROUTERS,
+        "databases": {alias: _connection_status(alias) for alias in connections},
+    })
@@ -2,4 +2,15 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edu2job_backend.settings')
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up (the consumer touches models)
+from predictions.consumers import group_chat_socket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # HTTP -> Django as before; WebSockets -> group chat push
+    if scope['type'] == 'websocket':
+        await group_chat_socket(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,96 @@
+# backend/edu2job_backend/database.py
+#
+# Builds settings.DATABASES from environment variables.
+#
+#   DATABASE_URL          primary database (postgres://... or sqlite:///path)
+#   DATABASE_REPLICA_URL  optional read replica for dashboard rollup reads
+#                         (see edu2job_backend/routers.py)
+#   DB_CONN_MAX_AGE       seconds to keep a connection open between requests
+#                         (0 = close after each request, None = forever)
+#   DB_CONN_HEALTH_CHECKS ping a reused connection before handing it out
+#   DB_POOL               use psycopg 3's connection pool instead of
+#                         persistent connections (pip install "psycopg[pool]")
+#   DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT
+#   TEST_DATABASE_URL     database for `manage.py test` (default: local SQLite)
+
+import importlib.util
+import os
+import sys
+
+import dj_database_url
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_conn_max_age(default):
+    value = os.environ.get('DB_CONN_MAX_AGE')
+    if value is None:
+        return default
+    return None if value.strip().lower() in ('none', 'forever') else int(value)
+
+
+def pool_available():
+    """Django's built-in pool needs psycopg 3 + psycopg_pool (not psycopg2)."""
+    return all(importlib.util.find_spec(name) is not None for name in ('psycopg', 'psycopg_pool'))
+
+
+def database_config(url, conn_max_age=600, health_checks=True, pool=False, pool_options=None):
+    config = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=health_checks)
+
+    if pool and config['ENGINE'] == 'django.db.backends.postgresql':
+        if pool_available():
+            # Pooled connections go back to the pool after each request,
+            # so Django's own persistence must be off
+            config['CONN_MAX_AGE'] = 0
+            config.setdefault('OPTIONS', {})['pool'] = dict(pool_options or {})
+        else:
+            print("⚠️ Warning: DB_POOL is set but psycopg 3 / psycopg_pool is not installed; "
+                  "using persistent connections instead.")
+    return config
+
+
+def running_tests(argv=None):
+    argv = argv if argv is not None else sys.argv
+    return len(argv) > 1 and argv[1] == 'test'
+
+
+def build_databases(default_url, base_dir):
+    conn_max_age = env_conn_max_age(600)
+    health_checks = env_bool('DB_CONN_HEALTH_CHECKS', True)
+    pool = env_bool('DB_POOL', False)
+    pool_options = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    }
+
+    if running_tests():
+        # Local stand-in: never run the test suite against the production database
+        url = os.environ.get('TEST_DATABASE_URL', f"sqlite:///{base_dir / 'test_db.sqlite3'}")
+        return {'default': database_config(url, conn_max_age=0, health_checks=False)}
+
+    databases = {
+        'default': database_config(
+            os.environ.get('DATABASE_URL', default_url),
+            conn_max_age=conn_max_age, health_checks=health_checks,
+            pool=pool, pool_options=pool_options,
+        ),
+    }
+
+    replica_url = os.environ.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        replica = database_config(
+            replica_url,
+            conn_max_age=conn_max_age, health_checks=health_checks,
+            pool=pool, pool_options=pool_options,
+        )
+        # Tests (if they ever use it) read the primary through this alias
+        replica['TEST'] = {'MIRROR': 'default'}
+        databases['replica'] = replica
+
+    return databases
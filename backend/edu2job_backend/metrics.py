@@ -0,0 +1,160 @@
+# backend/edu2job_backend/metrics.py
+#
+# Minimal in-process metrics with Prometheus text exposition (no client
+# library needed). Recording is a bisect plus a few additions under one
+# lock, so it is cheap enough to run on every request.
+#
+# Values are per worker process (like the prediction cache); with several
+# gunicorn workers each scrape sees the worker that answered it.
+
+import bisect
+import threading
+from collections import defaultdict
+
+# Request latency (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Queries per request: a jump into the high buckets for one route is an N+1
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+# Model stages are sub-millisecond to tens of milliseconds
+MODEL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labelvalues, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, ('le', _number(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, ('le', '+Inf'))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labelvalues)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] += amount
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for labelvalues, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """
+        collector() -> iterable of (name, type, documentation, [(labels_dict, value), ...]);
+        used to export counters that already live elsewhere (caches, queues).
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print("Metrics Collector Error:", e)
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    label_text = _labels(tuple(labels), tuple(labels.values()))
+                    lines.append(f"{name}{label_text} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# --- Request metrics (edu2job_backend/middleware.py) ---
+http_request_duration = registry.register(Histogram(
+    'edu2job_http_request_duration_seconds', 'Request latency by route',
+    ('method', 'route', 'status'), LATENCY_BUCKETS,
+))
+http_request_queries = registry.register(Histogram(
+    'edu2job_http_request_db_queries', 'Database queries per request',
+    ('method', 'route'), QUERY_COUNT_BUCKETS,
+))
+http_request_db_duration = registry.register(Histogram(
+    'edu2job_http_request_db_seconds', 'Time spent in database queries per request',
+    ('method', 'route'), LATENCY_BUCKETS,
+))
+db_query_errors = registry.register(Counter(
+    'edu2job_db_query_errors_total', 'Database queries that raised', ('route',),
+))
+
+# --- Model metrics (predictions/predictor.py) ---
+model_stage_duration = registry.register(Histogram(
+    'edu2job_model_stage_seconds', 'Time per model stage (preprocess / predict_proba) per call',
+    ('stage',), MODEL_BUCKETS,
+))
+model_rows = registry.register(Counter(
+    'edu2job_model_rows_total', 'Rows scored by the model',
+))
@@ -0,0 +1,62 @@
+# backend/edu2job_backend/middleware.py
+
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.db import connections
+
+from .metrics import db_query_errors, http_request_db_duration, http_request_duration, http_request_queries
+
+
+class QueryStats:
+    """connection.execute_wrapper() hook: counts and times every query of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.errors = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.count += 1
+            self.seconds += perf_counter() - started
+
+
+def route_label(request):
+    # URL pattern (e.g. "api/messages/"), not the raw path, to keep label cardinality low
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None and match.route else 'unmatched'
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, DB query count and DB time per (method, route) into
+    edu2job_backend.metrics; exposed at /metrics. Streaming responses are
+    timed until the response object is returned, not until the last byte.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        elapsed = perf_counter() - started
+
+        route = route_label(request)
+        http_request_duration.observe(elapsed, request.method, route, str(response.status_code))
+        http_request_queries.observe(stats.count, request.method, route)
+        http_request_db_duration.observe(stats.seconds, request.method, route)
+        if stats.errors:
+            db_query_errors.inc(stats.errors, route)
+        return response
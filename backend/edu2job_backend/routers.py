@@ -0,0 +1,31 @@
+# backend/edu2job_backend/routers.py
+
+from django.conf import settings
+
+
+class ReplicaRouter:
+    """
+    Sends reads of the models in DATABASE_REPLICA_MODELS (dashboard
+    rollups) to the 'replica' database when one is configured
+    (DATABASE_REPLICA_URL). Everything else, and every write, goes to
+    'default'. Replica reads can lag the primary slightly, so never list a
+    model that is read back right after it is written.
+    """
+
+    def _replica_models(self):
+        return getattr(settings, 'DATABASE_REPLICA_MODELS', ())
+
+    def db_for_read(self, model, **hints):
+        if 'replica' in settings.DATABASES and model._meta.label in self._replica_models():
+            return 'replica'
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
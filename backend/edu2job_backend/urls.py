@@ -1,10 +1,13 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from .views import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("accounts.urls")),
     path("api/profile/", include("profiles.urls")),
     path("api/adminpanel/", include("adminpanel.urls")),
     path("api/", include("predictions.urls")),
+    path("metrics", metrics_view, name="metrics"),  # Prometheus scrape target
 ]
\ No newline at end of file
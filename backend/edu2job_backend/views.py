@@ -0,0 +1,26 @@
+# backend/edu2job_backend/views.py
+
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from .metrics import registry
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Requires 'Authorization: Bearer <METRICS_TOKEN>'.
+    Without a token it is a 404 unless DEBUG or METRICS_PUBLIC is on, so a
+    deploy that forgot the token doesn't publish its internals.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied, token):
+            return HttpResponse("Unauthorized", status=401, content_type='text/plain')
+    elif not (settings.DEBUG or getattr(settings, 'METRICS_PUBLIC', False)):
+        return HttpResponse("Not Found", status=404, content_type='text/plain')
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,27 @@
+# backend/gunicorn.conf.py
+#
+# Start command (run from backend/):  gunicorn
+#
+# gunicorn picks this file up from the working directory. It serves the ASGI
+# app (edu2job_backend/asgi.py) through uvicorn workers, so HTTP and the
+# group chat WebSocket (/ws/groups/<id>/) share one port. Plain
+# `gunicorn edu2job_backend.wsgi` still works for HTTP but has no WebSockets.
+#
+# Chat push is fanned out in memory per process. With more than one worker
+# a message saved in one worker must reach sockets held by the others, which
+# needs Redis (CHAT_REDIS_URL, or a redis:// CACHE_URL). Without it we run a
+# single worker rather than silently drop pushes.
+
+import os
+
+wsgi_app = 'edu2job_backend.asgi:application'
+worker_class = 'uvicorn_worker.UvicornWorker'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+_redis_url = os.environ.get('CHAT_REDIS_URL') or os.environ.get('CACHE_URL', '')
+if workers > 1 and not _redis_url.startswith(('redis://', 'rediss://')):
+    print(f"⚠️ Warning: WEB_CONCURRENCY={workers} but no CHAT_REDIS_URL; "
+          "running 1 worker so group chat push reaches every socket.")
+    workers = 1
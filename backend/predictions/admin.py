@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TrainingData, JobPrediction
+from .models import TrainingData, JobPrediction, RetrainJob
 
 @admin.register(TrainingData)
 class TrainingDataAdmin(admin.ModelAdmin):
@@ -13,4 +13,10 @@ class JobPredictionAdmin(admin.ModelAdmin):
     list_display = ('user', 'predicted_role', 'confidence_score', 'created_at')
     list_filter = ('predicted_role', 'created_at')
     search_fields = ('user__username', 'predicted_role', 'skills')
-    readonly_fields = ('created_at',)
\ No newline at end of file
+    readonly_fields = ('created_at',)
+
+@admin.register(RetrainJob)
+class RetrainJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'progress', 'stage', 'row_count', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'metrics')
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class PredictionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'predictions'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from edu2job_backend.metrics import registry
+        from .metrics import collect
+        registry.register_collector(collect)
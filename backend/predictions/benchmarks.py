@@ -0,0 +1,62 @@
+# backend/predictions/benchmarks.py
+#
+# Helpers shared by the bench_* management commands.
+# Nothing here is imported by the API at runtime.
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+DEGREES = ['B.Tech', 'M.Tech', 'B.Sc', 'M.Sc', 'MCA', 'BCA', 'MBA', 'B.Com']
+BRANCHES = ['CSE', 'ECE', 'EEE', 'Mechanical', 'Civil', 'IT', 'Maths', 'Commerce', 'Data Science']
+
+
+def synthetic_training_frame(rows, vocabulary_size=2000, n_roles=20, seed=42):
+    """
+    TrainingData-shaped DataFrame with a learnable signal: each role draws
+    most of its skills from its own slice of the vocabulary.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"skill{i:05d}" for i in range(vocabulary_size)])
+    pool_size = max(vocabulary_size // n_roles, 1)
+
+    roles = rng.integers(0, n_roles, size=rows)
+    counts = rng.integers(3, 9, size=rows)
+    from_pool = rng.random((rows, 8)) < 0.7
+    pool_picks = roles[:, None] * pool_size + rng.integers(0, pool_size, size=(rows, 8))
+    random_picks = rng.integers(0, vocabulary_size, size=(rows, 8))
+    picks = np.where(from_pool, pool_picks % vocabulary_size, random_picks)
+
+    names = vocabulary[picks]
+    skills = [', '.join(names[i, :counts[i]]) for i in range(rows)]
+
+    return pd.DataFrame({
+        'degree': rng.choice(DEGREES, size=rows),
+        'branch': rng.choice(BRANCHES, size=rows),
+        'cgpa': np.round(rng.uniform(5.0, 10.0, size=rows), 2),
+        'skills': skills,
+        'job_role': np.char.add('Role ', roles.astype(str)),
+    })
+
+
+@contextmanager
+def measure():
+    """Yields a dict filled with wall seconds and peak traced MB on exit."""
+    result = {}
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['seconds'] = time.perf_counter() - started
+        result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+
+def matrix_mb(X):
+    if hasattr(X, 'data') and hasattr(X, 'indptr'):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 2**20
+    return X.nbytes / 2**20
@@ -0,0 +1,122 @@
+# backend/predictions/cache.py
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+def normalize_skills(skills):
+    """'Python, SQL,python ' -> 'python, sql' (lowercased, deduped, sorted)."""
+    parts = {part.strip().lower() for part in str(skills or '').split(',')}
+    return ', '.join(sorted(part for part in parts if part))
+
+
+def normalize_input(data):
+    """Canonical form of a prediction request; equal profiles hash equally."""
+    return {
+        'highest_degree': str(data.get('highest_degree') or '').strip(),
+        'branch': str(data.get('branch') or '').strip(),
+        'cgpa': round(float(data.get('cgpa')), 2),
+        'skills': normalize_skills(data.get('skills')),
+    }
+
+
+def make_key(normalized):
+    payload = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU + TTL cache of ranked predictions.
+
+    Entries belong to one model version: the first lookup with a different
+    version clears the cache, so a hot-swapped model never serves stale results.
+    """
+
+    def __init__(self, max_entries=None, ttl_seconds=None):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, 'ML_PREDICTION_CACHE_SIZE', 10000)
+
+    @property
+    def ttl_seconds(self):
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return getattr(settings, 'ML_PREDICTION_CACHE_TTL', 600)
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _check_version(self, version):
+        # Caller holds the lock
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key, version):
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, version, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "version": self._version,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+prediction_cache = PredictionCache()
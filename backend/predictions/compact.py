@@ -0,0 +1,290 @@
+# backend/predictions/compact.py
+#
+# Compact model artifact: the fitted Predictor as flat NumPy arrays plus
+# small JSON files, written next to predictor.joblib on publish.
+#
+# predictor.joblib has to be unpickled into private memory by every
+# gunicorn worker. The .npy files here are opened with mmap_mode='r', so
+# loading is a few file opens and every worker on the box reads the same
+# page-cache pages instead of holding its own copy of the forest.
+#
+# Layout of <version>/compact/:
+#   model.json        kind, classes, encoders, vectorizer config, metadata
+#   vocabulary.json   TF-IDF term -> column      (TF-IDF only)
+#   idf.npy           TF-IDF idf weights         (TF-IDF only)
+#   forest: roots, left, right, feature, threshold, leaf_index, leaf_values (.npy)
+#   linear: scale, coef, intercept (.npy)
+#
+# CompactForest / CompactLinear reproduce predict_proba() of the
+# RandomForestClassifier / MaxAbsScaler+SGD pipeline they were exported from.
+
+import json
+import os
+
+import numpy as np
+from scipy import sparse
+from scipy.special import expit
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder
+
+from .features import split_skills
+from .predictor import Predictor
+
+COMPACT_DIR = 'compact'
+MODEL_FILE = 'model.json'
+VOCABULARY_FILE = 'vocabulary.json'
+# 2: leaf values stored as float64 (1 stored float32 and could shift a score by 0.01)
+FORMAT_VERSION = 2
+
+# Callables a vectorizer may reference; stored by name
+TOKENIZERS = {'split_skills': split_skills}
+VECTORIZERS = {'tfidf': TfidfVectorizer, 'hashing': HashingVectorizer}
+
+# Rows densified at once while walking the trees
+ROWS_PER_BLOCK = 256
+
+
+class UnsupportedModel(Exception):
+    pass
+
+
+# ==========================================
+# Models
+# ==========================================
+
+class CompactForest:
+    """
+    Random Forest as concatenated node arrays. All trees are walked at once:
+    one (rows x trees) array of node ids advances a level per step.
+    """
+
+    def __init__(self, classes, n_features, max_depth, roots, left, right, feature, threshold,
+                 leaf_index, leaf_values):
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+        self.max_depth = max_depth
+        self.roots = roots
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.leaf_index = leaf_index
+        self.leaf_values = leaf_values
+
+    def apply(self, dense):
+        """Leaf node id reached in every tree, shape (rows, trees)."""
+        rows = np.arange(dense.shape[0])[:, None]
+        node = np.repeat(np.asarray(self.roots)[None, :], dense.shape[0], axis=0)
+        for _ in range(self.max_depth):
+            left = self.left[node]
+            internal = left >= 0
+            if not internal.any():
+                break
+            # Leaves have feature -2; their (wrapped) lookup is masked out below
+            go_left = dense[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(internal, np.where(go_left, left, self.right[node]), node)
+        return node
+
+    def predict_proba(self, X):
+        X = sparse.csr_matrix(X)
+        out = np.empty((X.shape[0], len(self.classes_)))
+        for start in range(0, X.shape[0], ROWS_PER_BLOCK):
+            dense = X[start:start + ROWS_PER_BLOCK].toarray()
+            leaves = self.leaf_index[self.apply(dense)]
+            # Summed tree by tree, then divided, exactly like
+            # RandomForestClassifier.predict_proba, so scores match to the bit
+            block = np.zeros((len(dense), len(self.classes_)))
+            for tree in range(leaves.shape[1]):
+                block += self.leaf_values[leaves[:, tree]]
+            out[start:start + len(dense)] = block / leaves.shape[1]
+        return out
+
+
+class CompactLinear:
+    """MaxAbsScaler + logistic-loss SGDClassifier (the streaming trainer's model)."""
+
+    def __init__(self, classes, n_features, scale, coef, intercept):
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+        self.scale = scale
+        self.coef = coef
+        self.intercept = intercept
+
+    def predict_proba(self, X):
+        # Scaled in place in X's own dtype, like MaxAbsScaler.transform
+        X = sparse.csr_matrix(X, copy=True)
+        X.data *= (1.0 / np.asarray(self.scale))[X.indices]
+        scores = expit(np.asarray(X @ self.coef.T) + self.intercept)
+        if scores.shape[1] == 1:
+            return np.hstack((1 - scores, scores))
+        # One-vs-rest, normalised like SGDClassifier.predict_proba
+        return scores / scores.sum(axis=1, keepdims=True)
+
+
+# ==========================================
+# Export
+# ==========================================
+
+def _forest_arrays(clf):
+    trees = [estimator.tree_ for estimator in clf.estimators_]
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+
+    def shifted(children, offset):
+        return np.where(children >= 0, children + offset, -1)
+
+    left = np.concatenate([shifted(t.children_left, o) for t, o in zip(trees, offsets)]).astype(np.int32)
+    right = np.concatenate([shifted(t.children_right, o) for t, o in zip(trees, offsets)]).astype(np.int32)
+    values = np.concatenate([t.value[:, 0, :] for t in trees])
+
+    # Only leaves need class probabilities; kept as the trees' own float64
+    # values (already per-leaf fractions) so no score changes in rounding
+    is_leaf = left < 0
+    leaf_index = np.full(len(left), -1, dtype=np.int32)
+    leaf_index[is_leaf] = np.arange(is_leaf.sum(), dtype=np.int32)
+
+    arrays = {
+        'roots': offsets.astype(np.int32),
+        'left': left,
+        'right': right,
+        'feature': np.concatenate([t.feature for t in trees]).astype(np.int32),
+        # float64 like sklearn, so float32 features split exactly the same way
+        'threshold': np.concatenate([t.threshold for t in trees]),
+        'leaf_index': leaf_index,
+        'leaf_values': values[is_leaf],
+    }
+    return arrays, {'max_depth': int(max(t.max_depth for t in trees))}
+
+
+def _linear_arrays(pipeline):
+    scaler, clf = pipeline.named_steps['scale'], pipeline.named_steps['clf']
+    arrays = {'scale': scaler.scale_, 'coef': clf.coef_, 'intercept': clf.intercept_}
+    return arrays, {}
+
+
+def _vectorizer_config(vectorizer):
+    kind = next((name for name, cls in VECTORIZERS.items() if type(vectorizer) is cls), None)
+    if kind is None:
+        raise UnsupportedModel(f"Unsupported vectorizer {type(vectorizer).__name__}")
+
+    params = {}
+    for key, value in vectorizer.get_params().items():
+        if key == 'vocabulary':
+            continue  # vocabulary_ is stored on its own
+        if key == 'dtype':
+            value = np.dtype(value).name
+        elif key == 'ngram_range':
+            value = list(value)
+        elif callable(value):
+            name = next((n for n, fn in TOKENIZERS.items() if fn is value), None)
+            if name is None:
+                raise UnsupportedModel(f"Vectorizer {key} {value!r} can't be exported")
+            value = {'callable': name}
+        params[key] = value
+    return {'kind': kind, 'params': params}
+
+
+def export_compact(predictor, path):
+    """Write `predictor` as a compact artifact into directory `path`."""
+    model = predictor.model
+    if isinstance(model, RandomForestClassifier):
+        kind = 'forest'
+        arrays, extra = _forest_arrays(model)
+    elif isinstance(model, Pipeline) and list(model.named_steps) == ['scale', 'clf']:
+        kind = 'linear'
+        arrays, extra = _linear_arrays(model)
+    else:
+        raise UnsupportedModel(f"Unsupported model {type(model).__name__}")
+
+    preprocessor = predictor.preprocessor
+    vectorizer = preprocessor.tfidf
+    config = {
+        'format_version': FORMAT_VERSION,
+        'kind': kind,
+        'classes': [str(c) for c in model.classes_],
+        'n_features': int(model.n_features_in_),
+        'degrees': [str(c) for c in preprocessor.le_degree.classes_],
+        'branches': [str(c) for c in preprocessor.le_branch.classes_],
+        'vectorizer': _vectorizer_config(vectorizer),
+        'metadata': predictor.metadata,
+        **extra,
+    }
+
+    os.makedirs(path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+    if hasattr(vectorizer, 'vocabulary_'):
+        with open(os.path.join(path, VOCABULARY_FILE), 'w') as fh:
+            json.dump({term: int(index) for term, index in vectorizer.vocabulary_.items()}, fh)
+        np.save(os.path.join(path, 'idf.npy'), vectorizer.idf_)
+    # model.json last: its presence marks a complete export
+    with open(os.path.join(path, MODEL_FILE), 'w') as fh:
+        json.dump(config, fh, default=str)
+
+
+# ==========================================
+# Load
+# ==========================================
+
+def _label_encoder(labels):
+    encoder = LabelEncoder()
+    encoder.classes_ = np.array(labels, dtype=object)
+    return encoder
+
+
+def _load_vectorizer(config, path):
+    params = {
+        key: TOKENIZERS[value['callable']] if isinstance(value, dict) else value
+        for key, value in config['params'].items()
+    }
+    params['dtype'] = np.dtype(params['dtype'])
+    params['ngram_range'] = tuple(params['ngram_range'])
+
+    if config['kind'] == 'hashing':
+        return HashingVectorizer(**params)
+
+    with open(os.path.join(path, VOCABULARY_FILE)) as fh:
+        params['vocabulary'] = json.load(fh)
+    vectorizer = TfidfVectorizer(**params)
+    vectorizer.idf_ = np.load(os.path.join(path, 'idf.npy'))
+    return vectorizer
+
+
+def has_compact(model_dir):
+    return os.path.exists(os.path.join(model_dir, COMPACT_DIR, MODEL_FILE))
+
+
+def compact_paths(model_dir):
+    path = os.path.join(model_dir, COMPACT_DIR)
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))]
+
+
+def load_compact(model_dir, mmap_mode='r'):
+    """Predictor backed by memory-mapped arrays from <model_dir>/compact/."""
+    path = os.path.join(model_dir, COMPACT_DIR)
+    with open(os.path.join(path, MODEL_FILE)) as fh:
+        config = json.load(fh)
+    if config.get('format_version') != FORMAT_VERSION:
+        raise UnsupportedModel(f"Compact format {config.get('format_version')} is not supported")
+
+    def array(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+
+    classes = np.array(config['classes'], dtype=object)
+    if config['kind'] == 'forest':
+        model = CompactForest(
+            classes, config['n_features'], config['max_depth'],
+            **{name: array(name) for name in
+               ('roots', 'left', 'right', 'feature', 'threshold', 'leaf_index', 'leaf_values')},
+        )
+    else:
+        model = CompactLinear(classes, config['n_features'], array('scale'), array('coef'), array('intercept'))
+
+    return Predictor(
+        model,
+        _label_encoder(config['degrees']),
+        _label_encoder(config['branches']),
+        _load_vectorizer(config['vectorizer'], path),
+        metadata=config['metadata'],
+    )
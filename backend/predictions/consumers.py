@@ -0,0 +1,128 @@
+# backend/predictions/consumers.py
+#
+# Raw ASGI WebSocket endpoint for group chat (no Channels dependency):
+#
+#   ws(s)://<host>/ws/groups/<group_id>/?token=<JWT access token>
+#
+# Server -> client: every new GroupMessage in the group, same JSON shape as
+#                   GET /api/messages/ rows.
+# Client -> server: {"content": "..."} posts a message (same as POST /api/messages/).
+# Rejections: the socket is accepted, then closed with 4401 (bad token) or
+# 4404 (no such group).
+#
+# Served by the uvicorn workers configured in gunicorn.conf.py.
+
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import GroupMessage, StudyGroup
+from .realtime import chat_hub, ensure_relay_listening
+
+GROUP_PATH = re.compile(r'^/ws/groups/(?P<group_id>\d+)/?$')
+
+# Application-level close codes (4000-4999)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+
+
+def match_group_path(path):
+    match = GROUP_PATH.match(path)
+    return int(match.group('group_id')) if match else None
+
+
+@sync_to_async
+def _authenticate(token):
+    try:
+        user_id = AccessToken(token)[api_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+
+@sync_to_async
+def _group_exists(group_id):
+    return StudyGroup.objects.filter(pk=group_id).exists()
+
+
+@sync_to_async
+def _create_message(group_id, user, content):
+    # post_save signals update the group counters and publish to the hub (predictions/signals.py)
+    with transaction.atomic():
+        GroupMessage.objects.create(group_id=group_id, user=user, content=content)
+
+
+async def group_chat_socket(scope, receive, send):
+    group_id = match_group_path(scope['path'])
+
+    # Handshake
+    event = await receive()
+    if event['type'] != 'websocket.connect':
+        return
+
+    query = parse_qs(scope.get('query_string', b'').decode())
+    user = await _authenticate(query.get('token', [''])[0])
+    if user is None:
+        close_code = CLOSE_UNAUTHORIZED
+    elif group_id is None or not await _group_exists(group_id):
+        close_code = CLOSE_NOT_FOUND
+    else:
+        close_code = None
+
+    # Rejections are accepted too, then closed: a close during the handshake
+    # reaches the browser as a bare HTTP 403 with no 4401/4404 code
+    if close_code is not None:
+        await send({'type': 'websocket.accept'})
+        await send({'type': 'websocket.close', 'code': close_code})
+        return
+
+    # Subscribe before accepting, so nothing posted after onopen is missed
+    ensure_relay_listening()
+    entry = chat_hub.subscribe(group_id)
+    _loop, queue = entry
+    await send({'type': 'websocket.accept'})
+
+    pushing = asyncio.ensure_future(_push(queue, send))
+    try:
+        while True:
+            event = await receive()
+            if event['type'] == 'websocket.disconnect':
+                break
+            if event['type'] == 'websocket.receive':
+                await _handle_incoming(event, group_id, user, send)
+    finally:
+        chat_hub.unsubscribe(group_id, entry)
+        pushing.cancel()
+
+
+async def _push(queue, send):
+    while True:
+        payload = await queue.get()
+        await send({'type': 'websocket.send', 'text': json.dumps(payload, default=str)})
+
+
+async def _send_error(send, message):
+    await send({'type': 'websocket.send', 'text': json.dumps({'error': message})})
+
+
+async def _handle_incoming(event, group_id, user, send):
+    try:
+        data = json.loads(event.get('text') or '{}')
+    except ValueError:
+        await _send_error(send, "Invalid JSON.")
+        return
+    # Valid JSON can still be 5, [] or "x"
+    if not isinstance(data, dict):
+        await _send_error(send, 'Send an object like {"content": "..."}.')
+        return
+    content = str(data.get('content', '')).strip()
+    if content:
+        await _create_message(group_id, user, content)
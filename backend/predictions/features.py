@@ -0,0 +1,106 @@
+# backend/predictions/features.py
+#
+# One feature layout for training AND inference:
+#   [degree_code, branch_code, cgpa | skills tf-idf (or hashed) ...]
+# built as a scipy CSR matrix, so a large skills vocabulary costs memory
+# proportional to the skills students actually list, not to vocab size.
+#
+# Skills are encoded by either
+#   'tfidf'    a fitted TfidfVectorizer (top max_features words, vocabulary pickled), or
+#   'hashing'  a stateless HashingVectorizer over whole comma-separated skills:
+#              nothing to fit or store, single pass, no skill dropped.
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import LabelEncoder
+
+# Random Forest casts to float32 internally, so building in float32
+# saves a full copy without changing any prediction.
+FEATURE_DTYPE = np.float32
+
+DEFAULT_MAX_FEATURES = 50
+DEFAULT_HASH_FEATURES = 2 ** 14
+
+SKILL_ENCODERS = ('tfidf', 'hashing')
+
+
+def split_skills(text):
+    """
+    "Python, Machine Learning , SQL" -> ['python', 'machine learning', 'sql'];
+    the comma-separated format UserProfile.skills and the CSVs use.
+    Module-level so vectorizers using it still pickle.
+    """
+    return [skill for skill in (part.strip() for part in text.split(',')) if skill]
+
+
+def category_lookup(encoder):
+    """Fitted LabelEncoder -> {label: code} dict for fast, unseen-safe encoding."""
+    return {label: code for code, label in enumerate(encoder.classes_)}
+
+
+def encode_categories(values, lookup):
+    """Labels -> codes; labels the encoder never saw map to 0 (same as before)."""
+    return np.fromiter((lookup.get(v, 0) for v in values), dtype=FEATURE_DTYPE, count=len(values))
+
+
+def stack_features(degree_codes, branch_codes, cgpa, skills_matrix):
+    """Combine the three numeric columns with the (sparse) skills matrix into CSR."""
+    numeric = np.column_stack((degree_codes, branch_codes, cgpa)).astype(FEATURE_DTYPE, copy=False)
+    return sparse.hstack(
+        (sparse.csr_matrix(numeric), sparse.csr_matrix(skills_matrix, dtype=FEATURE_DTYPE)),
+        format='csr',
+        dtype=FEATURE_DTYPE,
+    )
+
+
+def fit_transform_features(degrees, branches, cgpa, skills, max_features=DEFAULT_MAX_FEATURES,
+                           skill_encoder='tfidf', hash_features=DEFAULT_HASH_FEATURES):
+    """
+    Fit encoders + the skills vectorizer on training columns and return
+    (le_degree, le_branch, vectorizer, X) with X as float32 CSR.
+    """
+    if skill_encoder not in SKILL_ENCODERS:
+        raise ValueError(f"skill_encoder must be one of {SKILL_ENCODERS}")
+
+    le_degree = LabelEncoder()
+    degree_codes = le_degree.fit_transform(degrees)
+
+    le_branch = LabelEncoder()
+    branch_codes = le_branch.fit_transform(branches)
+
+    if skill_encoder == 'hashing':
+        vectorizer = hashing_vectorizer(hash_features)
+        skills_matrix = vectorizer.transform(skills)
+    else:
+        vectorizer = TfidfVectorizer(max_features=max_features, dtype=FEATURE_DTYPE)
+        skills_matrix = vectorizer.fit_transform(skills)
+
+    X = stack_features(degree_codes, branch_codes, np.asarray(cgpa, dtype=FEATURE_DTYPE), skills_matrix)
+    return le_degree, le_branch, vectorizer, X
+
+
+def hashing_vectorizer(n_features=DEFAULT_HASH_FEATURES):
+    """
+    Stateless stand-in for the fitted TF-IDF: nothing to fit, so it works on
+    streamed chunks. Same transform() interface, so the preprocessor can't
+    tell the difference. One feature per whole skill (split_skills), l2
+    normalised like TF-IDF.
+    """
+    return HashingVectorizer(
+        n_features=n_features,
+        tokenizer=split_skills,
+        token_pattern=None,
+        alternate_sign=False,
+        dtype=FEATURE_DTYPE,
+    )
+
+
+def transform_features(degrees, branches, cgpa, skills, degree_lookup, branch_lookup, tfidf):
+    """Inference-side twin of fit_transform_features() using already-fitted encoders."""
+    return stack_features(
+        encode_categories(degrees, degree_lookup),
+        encode_categories(branches, branch_lookup),
+        np.asarray(cgpa, dtype=FEATURE_DTYPE),
+        tfidf.transform(skills),
+    )
@@ -0,0 +1,174 @@
+# backend/predictions/ingestion.py
+
+import csv
+import io
+import itertools
+import re
+import warnings
+
+import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import TrainingData
+from .signals import bulk_created
+
+REQUIRED_COLUMNS = ['degree', 'branch', 'cgpa', 'skills', 'job_role']
+# CharField limits on TrainingData; longer values would fail the INSERT
+MAX_LENGTHS = {'degree': 100, 'branch': 100, 'job_role': 100}
+# Malformed lines listed per chunk in the report (all are counted)
+MAX_REPORTED_BAD_LINES = 100
+
+SKIPPED_LINE = re.compile(r'Skipping line (\d+)')
+
+
+class CSVFormatError(Exception):
+    pass
+
+
+def clean_chunk(chunk):
+    """
+    Vectorized cleanup of one DataFrame chunk (all columns read as str).
+    Returns (clean_df, rejected_count).
+    """
+    chunk.columns = [c.strip().lower() for c in chunk.columns]
+    missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise CSVFormatError(f"Missing required columns: {', '.join(missing)}")
+
+    df = chunk[REQUIRED_COLUMNS].copy()
+    for col in ('degree', 'branch', 'skills', 'job_role'):
+        df[col] = df[col].fillna('').astype(str).str.strip()
+    df['cgpa'] = pd.to_numeric(df['cgpa'], errors='coerce')
+
+    valid = df['cgpa'].notna()
+    for col in ('degree', 'branch', 'skills', 'job_role'):
+        valid &= df[col] != ''
+    for col, limit in MAX_LENGTHS.items():
+        valid &= df[col].str.len() <= limit
+
+    clean = df[valid]
+    return clean, int(len(df) - len(clean))
+
+
+def _next_chunk(reader):
+    """
+    (chunk or None at EOF, [line numbers of malformed lines skipped]).
+    The C parser reports each line it drops (on_bad_lines='warn') as a
+    ParserWarning naming the line; they are collected here instead of
+    being printed and lost.
+    """
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', pd.errors.ParserWarning)
+        chunk = next(reader, None)
+    bad_lines = []
+    for warning in caught:
+        if issubclass(warning.category, pd.errors.ParserWarning):
+            bad_lines += [int(n) for n in SKIPPED_LINE.findall(str(warning.message))]
+        else:
+            warnings.warn_explicit(warning.message, warning.category, warning.filename, warning.lineno)
+    return chunk, bad_lines
+
+
+def _copy_supported():
+    return connection.vendor == 'postgresql' and getattr(settings, 'TRAINING_CSV_USE_COPY', True)
+
+
+def _insert_copy(df, source):
+    """PostgreSQL COPY ... FROM STDIN: one round trip per chunk, no ORM objects."""
+    buffer = io.StringIO()
+    out = df.assign(source=source, created_at=timezone.now().isoformat())
+    out.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+    buffer.seek(0)
+
+    columns = REQUIRED_COLUMNS + ['source', 'created_at']
+    sql = (
+        f'COPY {TrainingData._meta.db_table} ({", ".join(columns)}) '
+        f'FROM STDIN WITH (FORMAT csv)'
+    )
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy_expert'):  # psycopg2
+            raw.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _insert_orm(df, source, batch_size):
+    objs = [
+        TrainingData(degree=degree, branch=branch, cgpa=cgpa, skills=skills, job_role=job_role, source=source)
+        for degree, branch, cgpa, skills, job_role in df.itertuples(index=False, name=None)
+    ]
+    TrainingData.objects.bulk_create(objs, batch_size=batch_size)
+
+
+def ingest_training_csv(file, chunk_rows=None, batch_size=None, source='bulk_upload'):
+    """
+    Stream a training CSV into TrainingData without loading it all at once.
+
+    Reads `chunk_rows` rows at a time, cleans each chunk with column-wise
+    pandas ops, and inserts it in its own transaction (COPY on PostgreSQL,
+    bounded bulk_create elsewhere). Peak memory is one chunk, not one file.
+
+    Chunks are committed one by one, so if one fails (bad encoding, a parse
+    error, a database error) the ones before it stay in the table. Ingestion
+    stops there and the report says how far it got instead of raising.
+
+    Malformed lines (wrong number of fields) are skipped and counted as
+    rejected, with their line numbers in the chunk's "bad_lines".
+
+    Returns {"accepted", "rejected", "chunks": [per-chunk report, ...],
+    "failed": None or {"chunk", "first_line", "error"}}.
+    Raises CSVFormatError if required columns are missing (nothing is written).
+    """
+    chunk_rows = chunk_rows or getattr(settings, 'TRAINING_CSV_CHUNK_ROWS', 10000)
+    batch_size = batch_size or getattr(settings, 'TRAINING_CSV_BATCH_SIZE', 1000)
+    use_copy = _copy_supported()
+
+    reader = pd.read_csv(
+        file,
+        skipinitialspace=True,  # handles ' "Python, Java"' correctly
+        on_bad_lines='warn',  # collected by _next_chunk
+        dtype=str,
+        chunksize=chunk_rows,
+    )
+
+    report = {"accepted": 0, "rejected": 0, "chunks": [], "failed": None}
+    # CSV line the next chunk starts on (line 1 is the header). Approximate
+    # once quoted values spanned several lines.
+    first_line = 2
+    for number in itertools.count(1):
+        try:
+            chunk, bad_lines = _next_chunk(reader)  # parse/decode errors surface here
+            if chunk is None:
+                break
+            clean, rejected = clean_chunk(chunk)
+            rejected += len(bad_lines)
+
+            if len(clean):
+                with transaction.atomic():
+                    if use_copy:
+                        _insert_copy(clean, source)
+                    else:
+                        _insert_orm(clean, source, batch_size)
+                    bulk_created.send(sender=TrainingData, frame=clean)
+        except CSVFormatError:
+            raise
+        except Exception as e:
+            report["failed"] = {"chunk": number, "first_line": first_line, "error": str(e)}
+            break
+
+        report["accepted"] += len(clean)
+        report["rejected"] += rejected
+        report["chunks"].append({
+            "chunk": number,
+            "rows": len(chunk) + len(bad_lines),
+            "accepted": len(clean),
+            "rejected": rejected,
+            "bad_lines": bad_lines[:MAX_REPORTED_BAD_LINES],
+        })
+        first_line += len(chunk) + len(bad_lines)
+
+    return report
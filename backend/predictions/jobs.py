@@ -0,0 +1,89 @@
+# backend/predictions/jobs.py
+
+import traceback
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import RetrainJob
+from .training import retrain
+
+
+def enqueue_retrain(user=None, mode=None):
+    """
+    Queue a retrain, or return the job that is already queued/running so that
+    repeated clicks on "Retrain" don't pile up identical work.
+    `mode` is 'full', 'incremental' or 'streaming' (default: ML_RETRAIN_DEFAULT_MODE).
+    Returns (job, created).
+    """
+    pending = RetrainJob.objects.filter(
+        status__in=[RetrainJob.STATUS_QUEUED, RetrainJob.STATUS_RUNNING]
+    ).order_by('created_at').first()
+    if pending:
+        return pending, False
+    mode = mode or getattr(settings, 'ML_RETRAIN_DEFAULT_MODE', RetrainJob.MODE_FULL)
+    return RetrainJob.objects.create(requested_by=user, mode=mode), True
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest QUEUED job to RUNNING.
+    The conditional UPDATE means two workers can never claim the same job,
+    on any database backend.
+    """
+    for job in RetrainJob.objects.filter(status=RetrainJob.STATUS_QUEUED).order_by('created_at')[:5]:
+        claimed = RetrainJob.objects.filter(pk=job.pk, status=RetrainJob.STATUS_QUEUED).update(
+            status=RetrainJob.STATUS_RUNNING,
+            started_at=timezone.now(),
+            stage="starting",
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job):
+    def report(percent, stage, rows=None):
+        fields = {"progress": percent, "stage": stage}
+        if rows is not None:
+            fields["row_count"] = rows
+        RetrainJob.objects.filter(pk=job.pk).update(**fields)
+
+    try:
+        metrics = retrain(mode=job.mode, progress=report)
+    except Exception as e:
+        traceback.print_exc()
+        RetrainJob.objects.filter(pk=job.pk).update(
+            status=RetrainJob.STATUS_FAILED,
+            error=str(e),
+            finished_at=timezone.now(),
+        )
+    else:
+        RetrainJob.objects.filter(pk=job.pk).update(
+            status=RetrainJob.STATUS_SUCCEEDED,
+            progress=100,
+            stage="done",
+            row_count=metrics.get("rows"),
+            metrics=metrics,
+            finished_at=timezone.now(),
+        )
+    finally:
+        close_old_connections()
+
+    job.refresh_from_db()
+    return job
+
+
+def fail_stale_jobs(max_age):
+    """Mark RUNNING jobs older than `max_age` (timedelta) as failed, e.g. after a worker crash."""
+    cutoff = timezone.now() - max_age
+    return RetrainJob.objects.filter(
+        status=RetrainJob.STATUS_RUNNING, started_at__lt=cutoff
+    ).update(
+        status=RetrainJob.STATUS_FAILED,
+        error="Worker stopped before the job finished.",
+        finished_at=timezone.now(),
+    )
+
@@ -0,0 +1,55 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import LabelEncoder
+
+from predictions.benchmarks import matrix_mb, measure, synthetic_training_frame
+from predictions.features import fit_transform_features
+
+
+def dense_features(df, max_features):
+    """The pre-sparse retrain path: toarray() + np.hstack."""
+    df = df.copy()
+    df['degree_enc'] = LabelEncoder().fit_transform(df['degree'])
+    df['branch_enc'] = LabelEncoder().fit_transform(df['branch'])
+    skills_vec = TfidfVectorizer(max_features=max_features).fit_transform(df['skills']).toarray()
+    return np.hstack((df[['degree_enc', 'branch_enc', 'cgpa']].values, skills_vec))
+
+
+def sparse_features(df, max_features):
+    return fit_transform_features(df['degree'], df['branch'], df['cgpa'], df['skills'], max_features=max_features)[3]
+
+
+class Command(BaseCommand):
+    help = "Compare dense vs sparse feature building (time, peak memory, matrix size)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--max-features', type=int, nargs='+', default=[50, 1000])
+        parser.add_argument('--vocabulary', type=int, default=5000,
+                            help="Distinct skills in the synthetic data.")
+        parser.add_argument('--dense-limit-mb', type=int, default=4096,
+                            help="Skip the dense path when its matrix alone would exceed this.")
+
+    def handle(self, *args, **options):
+        header = f"{'rows':>9} {'max_feat':>8} {'path':>6} {'seconds':>9} {'peak MB':>9} {'X MB':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for rows in options['rows']:
+            df = synthetic_training_frame(rows, vocabulary_size=options['vocabulary'])
+            for max_features in options['max_features']:
+                dense_mb = rows * (max_features + 3) * 8 / 2**20
+                for name, build in (('dense', dense_features), ('sparse', sparse_features)):
+                    if name == 'dense' and dense_mb > options['dense_limit_mb']:
+                        self.stdout.write(
+                            f"{rows:>9} {max_features:>8} {name:>6} {'skipped':>9} {'':>9} {dense_mb:>9.1f}"
+                        )
+                        continue
+                    with measure() as stats:
+                        X = build(df, max_features)
+                    self.stdout.write(
+                        f"{rows:>9} {max_features:>8} {name:>6} {stats['seconds']:>9.2f} "
+                        f"{stats['peak_mb']:>9.1f} {matrix_mb(X):>9.1f}"
+                    )
+                    del X
@@ -0,0 +1,140 @@
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.registry import (
+    _current_rss_bytes,
+    default_model_dir,
+    load_bundle,
+    read_current_version,
+    resolve_version_dir,
+)
+
+FORMATS = ('joblib', 'compact')
+
+
+def memory_rollup():
+    """Rss / Pss / Private / Shared MB of this process (Linux smaps_rollup)."""
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup') as fh:
+            for line in fh:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    except OSError:
+        return {}
+    return {
+        "rss_mb": fields.get('Rss'),
+        "pss_mb": fields.get('Pss'),
+        "private_mb": fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        "shared_mb": fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def sample_records(predictor, count, seed=0):
+    """Inputs built from the model's own categories and skills."""
+    rng = np.random.default_rng(seed)
+    preprocessor = predictor.preprocessor
+    vocabulary = list(getattr(preprocessor.tfidf, 'vocabulary_', {})) or [f"skill{i:05d}" for i in range(2000)]
+    return [
+        {
+            'highest_degree': str(rng.choice(preprocessor.le_degree.classes_)),
+            'branch': str(rng.choice(preprocessor.le_branch.classes_)),
+            'cgpa': float(rng.uniform(5, 10)),
+            'skills': ', '.join(rng.choice(vocabulary, size=5)),
+        }
+        for _ in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = ("Compare joblib.load and the memory-mapped compact artifact: load time, first "
+            "prediction and per-worker memory with N worker processes alive at once.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--format', nargs='+', default=list(FORMATS), choices=FORMATS)
+        parser.add_argument('--model-version', help="Model version (default: CURRENT).")
+        parser.add_argument('--warmup', type=int, default=2000,
+                            help="Predictions per worker after loading, to touch the model pages.")
+        parser.add_argument('--child', help=None)  # internal: format of one worker
+
+    def handle(self, *args, **options):
+        model_dir = default_model_dir()
+        version = options['model_version'] or read_current_version(model_dir)
+        version_dir = resolve_version_dir(model_dir, version)
+
+        if options['child']:
+            self._child(version_dir, version, options['child'], options['warmup'])
+            return
+
+        self.stdout.write(f"Model {version} in {version_dir}, {options['workers']} workers per format")
+        header = (f"{'format':>8} {'load ms':>9} {'1st pred ms':>11} {'pred ms':>8} {'artifact MB':>11} "
+                  f"{'RSS +MB':>8} {'PSS MB':>8} {'private MB':>10} {'sum PSS MB':>10}")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for model_format in options['format']:
+            results = self._run_workers(model_format, options)
+            mean = {key: float(np.mean([r[key] for r in results])) for key in results[0] if key != 'model_format'}
+            self.stdout.write(
+                f"{results[0]['model_format']:>8} {mean['load_ms']:>9.1f} {mean['first_predict_ms']:>11.2f} "
+                f"{mean['predict_ms']:>8.3f} {mean['artifact_mb']:>11.1f} {mean['rss_delta_mb']:>8.1f} "
+                f"{mean['pss_mb']:>8.1f} {mean['private_mb']:>10.1f} {sum(r['pss_mb'] for r in results):>10.1f}"
+            )
+
+    def _run_workers(self, model_format, options):
+        command = [sys.executable, sys.argv[0], 'bench_model_load', '--child', model_format,
+                   '--warmup', str(options['warmup'])]
+        if options['model_version']:
+            command += ['--model-version', options['model_version']]
+        workers = [
+            subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+            for _ in range(options['workers'])
+        ]
+        # Measure only once every worker has loaded, so shared pages are split N ways
+        for worker in workers:
+            for line in worker.stdout:
+                if line.strip() == 'READY':
+                    break
+            else:
+                raise CommandError(f"A {model_format} worker exited before loading the model")
+        results = []
+        for worker in workers:
+            output, _ = worker.communicate('\n')
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        return results
+
+    def _child(self, version_dir, version, model_format, warmup):
+        rss_before = _current_rss_bytes()
+        bundle = load_bundle(version_dir, version=version, model_format=model_format)
+        predictor = bundle.predictor
+
+        records = sample_records(predictor, max(warmup, 1))
+        started = time.perf_counter()
+        predictor.predict_proba(records[:1])
+        first_predict = time.perf_counter() - started
+
+        timings = []
+        for record in records[1:]:
+            t0 = time.perf_counter()
+            predictor.predict_proba([record])
+            timings.append(time.perf_counter() - t0)
+
+        self.stdout.write('READY')
+        self.stdout.flush()
+        sys.stdin.readline()
+
+        self.stdout.write(json.dumps({
+            "model_format": bundle.model_format,
+            "load_ms": bundle.load_seconds * 1000,
+            "first_predict_ms": first_predict * 1000,
+            "predict_ms": float(np.median(timings)) * 1000 if timings else 0.0,
+            "artifact_mb": bundle.artifact_bytes / 2**20,
+            "rss_delta_mb": (_current_rss_bytes() - rss_before) / 2**20,
+            **memory_rollup(),
+        }))
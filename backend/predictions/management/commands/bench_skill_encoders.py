@@ -0,0 +1,85 @@
+import io
+import time
+
+import joblib
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from predictions.benchmarks import synthetic_training_frame
+from predictions.features import fit_transform_features
+from predictions.predictor import Predictor
+from predictions.training import build_classifier, fit_forest
+
+
+def pickled_bytes(obj):
+    buffer = io.BytesIO()
+    joblib.dump(obj, buffer)
+    return buffer.tell()
+
+
+def as_records(df):
+    return [
+        {'highest_degree': d, 'branch': b, 'cgpa': c, 'skills': s}
+        for d, b, c, s in zip(df['degree'], df['branch'], df['cgpa'], df['skills'])
+    ]
+
+
+class Command(BaseCommand):
+    help = ("Compare TF-IDF and hashed skill features: held-out accuracy, fit time, "
+            "single/batch prediction latency and artifact size.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50_000)
+        parser.add_argument('--vocabulary', type=int, default=2000,
+                            help="Distinct skills in the synthetic data.")
+        parser.add_argument('--tfidf', type=int, nargs='*', default=[50, 1000],
+                            help="TF-IDF max_features values to try.")
+        parser.add_argument('--hashing', type=int, nargs='*', default=[2 ** 10, 2 ** 14],
+                            help="Hashed n_features values to try.")
+        parser.add_argument('--estimators', type=int, default=100)
+        parser.add_argument('--test-share', type=float, default=0.2)
+        parser.add_argument('--latency-samples', type=int, default=200)
+
+    def handle(self, *args, **options):
+        df = synthetic_training_frame(options['rows'], vocabulary_size=options['vocabulary'])
+        split = int(len(df) * (1 - options['test_share']))
+        train, test = df.iloc[:split], df.iloc[split:]
+        test_records = as_records(test)
+        single = test_records[:options['latency_samples']]
+
+        configs = [('tfidf', n) for n in options['tfidf']] + [('hashing', n) for n in options['hashing']]
+
+        header = (f"{'encoder':>8} {'features':>8} {'fit s':>7} {'accuracy':>8} "
+                  f"{'1-row ms':>8} {'batch ms':>8} {'vec KB':>9} {'bundle MB':>9}")
+        self.stdout.write(f"{len(train)} train / {len(test)} test rows, {options['vocabulary']} distinct skills")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for encoder, n_features in configs:
+            started = time.perf_counter()
+            le_degree, le_branch, vectorizer, X = fit_transform_features(
+                train['degree'], train['branch'], train['cgpa'], train['skills'],
+                max_features=n_features, skill_encoder=encoder, hash_features=n_features,
+            )
+            clf = build_classifier(X.shape[0], n_estimators=options['estimators'], random_state=0)
+            fit_forest(clf, X, train['job_role'])
+            fit_seconds = time.perf_counter() - started
+
+            predictor = Predictor(clf, le_degree, le_branch, vectorizer)
+            accuracy = float(np.mean(predictor.classes_[predictor.predict_proba(test_records).argmax(axis=1)]
+                                     == test['job_role'].to_numpy()))
+
+            timings = []
+            for record in single:
+                t0 = time.perf_counter()
+                predictor.predict_proba([record])
+                timings.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            predictor.predict_proba(test_records)
+            batch_ms = (time.perf_counter() - t0) * 1000
+
+            self.stdout.write(
+                f"{encoder:>8} {n_features:>8} {fit_seconds:>7.2f} {accuracy:>8.4f} "
+                f"{np.median(timings) * 1000:>8.3f} {batch_ms:>8.1f} "
+                f"{pickled_bytes(vectorizer) / 1024:>9.1f} {pickled_bytes(predictor) / 2**20:>9.2f}"
+            )
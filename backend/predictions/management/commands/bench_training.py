@@ -0,0 +1,111 @@
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from joblib.externals.loky import get_reusable_executor
+
+from predictions.benchmarks import synthetic_training_frame
+from predictions.features import fit_transform_features
+from predictions.training import available_cpus, build_classifier, fit_forest, plan_parallelism
+
+
+def _maxrss_mb(who):
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def run_one(rows, n_jobs, backend, max_samples, n_estimators, vocabulary, max_features, memory_limit_mb):
+    """One training run; meant to be the only work in its process so peak RSS is its own."""
+    df = synthetic_training_frame(rows, vocabulary_size=vocabulary)
+    X = fit_transform_features(df['degree'], df['branch'], df['cgpa'], df['skills'], max_features=max_features)[3]
+    y = df['job_role']
+    del df
+
+    clf = build_classifier(X.shape[0], n_estimators=n_estimators, max_samples=max_samples, random_state=0)
+    plan = plan_parallelism(X, n_classes=y.nunique(), n_trees=n_estimators, max_samples=clf.max_samples,
+                            n_jobs=n_jobs, backend=backend, memory_limit_mb=memory_limit_mb)
+    before_fit_mb = _maxrss_mb(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    fit_forest(clf, X, y, plan=plan)
+    seconds = time.perf_counter() - started
+
+    # Reap loky workers so RUSAGE_CHILDREN includes them
+    get_reusable_executor().shutdown(wait=True)
+    return {
+        **plan,
+        "fit_seconds": round(seconds, 3),
+        "before_fit_rss_mb": round(before_fit_mb, 1),
+        "peak_rss_mb": round(_maxrss_mb(resource.RUSAGE_SELF), 1),
+        "worker_peak_rss_mb": round(_maxrss_mb(resource.RUSAGE_CHILDREN), 1),
+        "train_accuracy": round(float(clf.score(X, y)), 4),
+    }
+
+
+class Command(BaseCommand):
+    help = ("Benchmark Random Forest training across n_jobs / backends / max_samples. "
+            "Each configuration runs in a fresh subprocess so peak RSS is not shared.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[50_000, 200_000])
+        parser.add_argument('--jobs', type=int, nargs='+', default=None,
+                            help="n_jobs values (default: 1, 2, 4, ... up to every available core).")
+        parser.add_argument('--backend', nargs='+', default=['threads'], choices=['threads', 'processes'])
+        parser.add_argument('--max-samples', type=float, nargs='+', default=[0],
+                            help="0 = full bootstrap, <= 1 a fraction, > 1 a row count.")
+        parser.add_argument('--estimators', type=int, default=100)
+        parser.add_argument('--vocabulary', type=int, default=2000)
+        parser.add_argument('--max-features', type=int, default=50)
+        parser.add_argument('--memory-limit-mb', type=int, default=0)
+        parser.add_argument('--child', help=None)  # internal: JSON config of one run
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(run_one(**json.loads(options['child']))))
+            return
+
+        jobs = options['jobs']
+        if not jobs:
+            cpus = available_cpus()
+            jobs = sorted({1, cpus} | {2 ** i for i in range(1, cpus.bit_length()) if 2 ** i < cpus})
+
+        header = (f"{'rows':>8} {'backend':>9} {'max_smp':>7} {'n_jobs':>6} {'fit s':>8} "
+                  f"{'speedup':>7} {'start MB':>8} {'peak MB':>8} {'worker MB':>9} {'est MB':>8} {'acc':>6}")
+        self.stdout.write(f"{available_cpus()} cores available")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for rows in options['rows']:
+            for backend in options['backend']:
+                for max_samples in options['max_samples']:
+                    baseline = None
+                    for n_jobs in jobs:
+                        config = {
+                            "rows": rows, "n_jobs": n_jobs, "backend": backend,
+                            "max_samples": max_samples or None, "n_estimators": options['estimators'],
+                            "vocabulary": options['vocabulary'], "max_features": options['max_features'],
+                            "memory_limit_mb": options['memory_limit_mb'],
+                        }
+                        result = self._run_child(config)
+                        if result is None:
+                            continue
+                        baseline = baseline or result['fit_seconds']
+                        self.stdout.write(
+                            f"{rows:>8} {backend:>9} {max_samples or 'all':>7} {result['n_jobs']:>6} "
+                            f"{result['fit_seconds']:>8.2f} {baseline / result['fit_seconds']:>6.2f}x "
+                            f"{result['before_fit_rss_mb']:>8.1f} {result['peak_rss_mb']:>8.1f} {result['worker_peak_rss_mb']:>9.1f} "
+                            f"{result['estimated_peak_mb']:>8.1f} {result['train_accuracy']:>6.3f}"
+                        )
+
+    def _run_child(self, config):
+        completed = subprocess.run(
+            [sys.executable, sys.argv[0], 'bench_training', '--child', json.dumps(config)],
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            self.stderr.write(f"Run {config} failed:\n{completed.stderr[-2000:]}")
+            return None
+        # Last line is the JSON result; anything before it is training output
+        return json.loads(completed.stdout.strip().splitlines()[-1])
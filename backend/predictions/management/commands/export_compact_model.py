@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.registry import (
+    default_model_dir,
+    load_bundle,
+    read_current_version,
+    resolve_version_dir,
+    write_compact,
+)
+
+
+class Command(BaseCommand):
+    help = "Write the compact (mmap) export for an already published model version (default: CURRENT)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-version', help="Version name under ml_models/versions/ ('legacy' for the flat files).")
+
+    def handle(self, *args, **options):
+        model_dir = default_model_dir()
+        version = options['model_version'] or read_current_version(model_dir)
+        version_dir = resolve_version_dir(model_dir, version)
+
+        bundle = load_bundle(version_dir, version=version, model_format='joblib')
+        if not write_compact(bundle.predictor, version_dir):
+            raise CommandError("Compact export was skipped (see above, or ML_MODEL_COMPACT_EXPORT is off).")
+        self.stdout.write(self.style.SUCCESS(f"Compact export written for {bundle.version} in {version_dir}"))
@@ -0,0 +1,40 @@
+import json
+import sys
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.registry import model_registry
+
+
+class Command(BaseCommand):
+    help = "Score a CSV of profiles (highest_degree/degree, branch, cgpa, skills) with the live Predictor."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help="Input CSV, or '-' for stdin.")
+
+    def handle(self, *args, **options):
+        source = sys.stdin if options['csv_path'] == '-' else options['csv_path']
+        try:
+            df = pd.read_csv(source, skipinitialspace=True, dtype=str)
+        except Exception as e:
+            raise CommandError(f"Error reading CSV: {e}")
+
+        df.columns = [c.strip().lower() for c in df.columns]
+        if 'highest_degree' not in df.columns and 'degree' in df.columns:
+            df = df.rename(columns={'degree': 'highest_degree'})
+        records = df.fillna('').to_dict('records')
+
+        predictor = model_registry.get().predictor
+        valid_indices, errors = predictor.preprocessor.validate_many(records)
+        ranked = predictor.predict_top([records[i] for i in valid_indices]) if valid_indices else []
+        results = dict(zip(valid_indices, ranked))
+
+        for index in range(len(records)):
+            top_matches = results.get(index)
+            if top_matches:
+                line = {"index": index, "predicted_role": top_matches[0]['role'],
+                        "confidence_score": top_matches[0]['score'], "alternatives": top_matches[1:]}
+            else:
+                line = {"index": index, "error": errors.get(index, "Could not determine a suitable role.")}
+            self.stdout.write(json.dumps(line))
@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from predictions.jobs import claim_next_job, fail_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued /api/retrain/ jobs (run alongside gunicorn, no broker needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll', type=float, default=5.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true',
+                            help="Process at most one job and exit.")
+        parser.add_argument('--stale-minutes', type=int, default=120,
+                            help="RUNNING jobs older than this are marked failed at startup.")
+
+    def handle(self, *args, **options):
+        stale = fail_stale_jobs(timedelta(minutes=options['stale_minutes']))
+        if stale:
+            self.stdout.write(self.style.WARNING(f"Marked {stale} stale job(s) as failed."))
+
+        self.stdout.write("Retrain worker started.")
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll'])
+                continue
+
+            self.stdout.write(f"Running {job} ...")
+            job = run_job(job)
+            if job.status == job.STATUS_SUCCEEDED:
+                self.stdout.write(self.style.SUCCESS(f"{job} finished in {job.elapsed_seconds}s: {job.metrics}"))
+            else:
+                self.stdout.write(self.style.ERROR(f"{job} failed: {job.error}"))
+
+            if options['once']:
+                return
@@ -0,0 +1,25 @@
+# backend/predictions/metrics.py
+#
+# Exports the counters predictions already keeps (prediction cache,
+# history write-behind, chat hub) on /metrics; registered in apps.py.
+
+from .cache import prediction_cache
+from .realtime import chat_hub
+from .writebehind import history_writer
+
+
+def collect():
+    cache = prediction_cache.stats()
+    history = history_writer.stats()
+    chat = chat_hub.stats()
+    return [
+        ('edu2job_prediction_cache_hits_total', 'counter', 'Prediction cache hits', [({}, cache['hits'])]),
+        ('edu2job_prediction_cache_misses_total', 'counter', 'Prediction cache misses', [({}, cache['misses'])]),
+        ('edu2job_prediction_cache_entries', 'gauge', 'Entries in the prediction cache', [({}, cache['size'])]),
+        ('edu2job_history_queue_depth', 'gauge', 'Prediction history rows waiting to be written', [({}, history['queue_depth'])]),
+        ('edu2job_history_written_total', 'counter', 'Prediction history rows written', [({}, history['written'])]),
+        ('edu2job_history_failed_total', 'counter', 'Prediction history rows that failed to write', [({}, history['failed'])]),
+        ('edu2job_history_last_flush_ms', 'gauge', 'Duration of the last history flush', [({}, history['last_flush_ms'])]),
+        ('edu2job_chat_subscribers', 'gauge', 'Open group chat WebSocket subscriptions', [({}, chat['subscribers'])]),
+        ('edu2job_chat_dropped_total', 'counter', 'Chat pushes dropped for slow clients', [({}, chat['dropped'])]),
+    ]
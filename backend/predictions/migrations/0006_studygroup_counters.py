@@ -0,0 +1,85 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_counters(apps, schema_editor):
+    """Members = creator + everyone who has posted; counters from existing messages."""
+    StudyGroup = apps.get_model('predictions', 'StudyGroup')
+    GroupMessage = apps.get_model('predictions', 'GroupMessage')
+    GroupMembership = apps.get_model('predictions', 'GroupMembership')
+
+    pairs = set(GroupMessage.objects.values_list('group_id', 'user_id').distinct())
+    pairs.update(StudyGroup.objects.exclude(created_by=None).values_list('id', 'created_by_id'))
+    GroupMembership.objects.bulk_create(
+        [GroupMembership(group_id=g, user_id=u) for g, u in pairs],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    members = dict(GroupMembership.objects.values_list('group_id').annotate(n=Count('id')))
+    activity = {
+        row['group_id']: row
+        for row in GroupMessage.objects.values('group_id').annotate(n=Count('id'), last=Max('created_at'))
+    }
+    for group in StudyGroup.objects.all().only('id', 'created_at'):
+        row = activity.get(group.id, {})
+        group.members_count = members.get(group.id, 0)
+        group.messages_count = row.get('n', 0)
+        group.last_activity_at = row.get('last') or group.created_at
+        group.save(update_fields=['members_count', 'messages_count', 'last_activity_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0005_groupmessage_group_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='studygroup',
+            name='last_activity_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='studygroup',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='studygroup',
+            name='messages_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='studygroup',
+            index=models.Index(fields=['-created_at', '-id'], name='studygroup_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='groupmembership',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='predictions.studygroup'),
+        ),
+        migrations.AddField(
+            model_name='groupmembership',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_memberships', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='groupmembership',
+            constraint=models.UniqueConstraint(fields=('group', 'user'), name='unique_group_member'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
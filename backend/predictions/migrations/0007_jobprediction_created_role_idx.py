@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0006_studygroup_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobprediction',
+            index=models.Index(fields=['created_at', 'predicted_role'], name='jobprediction_created_role_idx'),
+        ),
+    ]
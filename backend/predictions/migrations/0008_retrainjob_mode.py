@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0007_jobprediction_created_role_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='retrainjob',
+            name='mode',
+            field=models.CharField(choices=[('full', 'Full refit'), ('incremental', 'Incremental (new rows only)')], default='full', max_length=20),
+        ),
+    ]
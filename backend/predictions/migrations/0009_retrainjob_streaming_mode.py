@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0008_retrainjob_mode'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='retrainjob',
+            name='mode',
+            field=models.CharField(choices=[('full', 'Full refit'), ('incremental', 'Incremental (new rows only)'), ('streaming', 'Streaming (out-of-core SGD)')], default='full', max_length=20),
+        ),
+    ]
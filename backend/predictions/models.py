@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 # ==========================================
 # 1. EXISTING PREDICTION MODELS
@@ -33,6 +34,12 @@ class JobPrediction(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Time-range scans (bucket backfill, per-role trends)
+            models.Index(fields=['created_at', 'predicted_role'], name='jobprediction_created_role_idx'),
+        ]
+
     def __str__(self):
         # Fallback in case user is deleted or username is missing
         username = self.user.username if self.user else "Unknown User"
@@ -49,9 +56,33 @@ class StudyGroup(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='created_groups')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized counters, maintained by predictions/signals.py
+    # (so listing groups never has to scan GroupMessage)
+    members_count = models.PositiveIntegerField(default=0)
+    messages_count = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='studygroup_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
+class GroupMembership(models.Model):
+    group = models.ForeignKey(StudyGroup, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='group_memberships')
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['group', 'user'], name='unique_group_member'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} in {self.group}"
+
 class GroupMessage(models.Model):
     group = models.ForeignKey(StudyGroup, on_delete=models.CASCADE, related_name='messages')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -60,6 +91,69 @@ class GroupMessage(models.Model):
 
     class Meta:
         ordering = ['created_at'] # Oldest messages first
+        indexes = [
+            # Incremental polling: WHERE group_id = X AND id > since_id ORDER BY id
+            models.Index(fields=['group', 'id'], name='groupmessage_group_id_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.user.username}: {self.content[:20]}..."
\ No newline at end of file
+        return f"{self.user.username}: {self.content[:20]}..."
+
+# ==========================================
+# 3. BACKGROUND RETRAINING JOBS
+# ==========================================
+
+class RetrainJob(models.Model):
+    """
+    One /api/retrain/ request. Picked up by `python manage.py retrain_worker`,
+    so the HTTP worker returns immediately instead of training in-request.
+    """
+    STATUS_QUEUED = 'QUEUED'
+    STATUS_RUNNING = 'RUNNING'
+    STATUS_SUCCEEDED = 'SUCCEEDED'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    MODE_FULL = 'full'
+    MODE_INCREMENTAL = 'incremental'
+    MODE_STREAMING = 'streaming'
+    MODE_CHOICES = (
+        (MODE_FULL, 'Full refit'),
+        (MODE_INCREMENTAL, 'Incremental (new rows only)'),
+        (MODE_STREAMING, 'Streaming (out-of-core SGD)'),
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    progress = models.PositiveSmallIntegerField(default=0)  # 0-100
+    stage = models.CharField(max_length=50, blank=True)
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default=MODE_FULL)
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    metrics = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    @property
+    def elapsed_seconds(self):
+        if not self.started_at:
+            return None
+        end = self.finished_at or timezone.now()
+        return round((end - self.started_at).total_seconds(), 2)
+
+    def __str__(self):
+        return f"RetrainJob #{self.pk} ({self.status})"
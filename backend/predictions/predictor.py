@@ -0,0 +1,115 @@
+# backend/predictions/predictor.py
+
+import functools
+import os
+from time import perf_counter
+
+import joblib
+import numpy as np
+
+from edu2job_backend.metrics import model_rows, model_stage_duration
+
+from .preprocessing import EducationPreprocessor
+
+PREDICTOR_FILE = 'predictor.joblib'
+
+# Four separate pickles written by older retrains; still loadable
+LEGACY_FILES = {
+    'model': 'career_model.pkl',
+    'le_degree': 'le_degree.pkl',
+    'le_branch': 'le_branch.pkl',
+    'tfidf': 'tfidf.pkl',
+}
+
+
+def rank_roles(probabilities, top_indices, classes):
+    """Roles for the given (best-first) indices, skipping zero scores."""
+    top_matches = []
+    for index in top_indices:
+        score = probabilities[index] * 100
+        if score > 0:
+            top_matches.append({"role": str(classes[index]), "score": round(float(score), 2)})
+    return top_matches
+
+
+class Predictor:
+    """
+    Fitted encoders + classifier as ONE object and ONE artifact.
+
+    The API (single + batch), predict_jobs(profile) and the CLI all go
+    through this class, so there is exactly one inference path to keep
+    in memory and to benchmark.
+    """
+
+    def __init__(self, model, le_degree, le_branch, tfidf, metadata=None):
+        self.model = model
+        self.preprocessor = EducationPreprocessor(le_degree=le_degree, le_branch=le_branch, tfidf=tfidf)
+        self.metadata = dict(metadata or {})
+
+    # --- Serialization ---
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path):
+        predictor = joblib.load(path)
+        if not isinstance(predictor, cls):
+            raise TypeError(f"{path} does not contain a Predictor")
+        return predictor
+
+    @classmethod
+    def from_legacy_dir(cls, model_dir):
+        """Build a Predictor from career_model.pkl + le_degree/le_branch/tfidf.pkl."""
+        loaded = {key: joblib.load(os.path.join(model_dir, name)) for key, name in LEGACY_FILES.items()}
+        return cls(**loaded)
+
+    # --- Inference ---
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    @property
+    def n_features(self):
+        return getattr(self.model, 'n_features_in_', None)
+
+    def validate(self, data):
+        return self.preprocessor.validate_input(data)
+
+    def transform(self, records):
+        return self.preprocessor.preprocess_many(records)
+
+    def predict_proba(self, records):
+        """records: list of dicts with highest_degree, branch, cgpa, skills (validated)."""
+        started = perf_counter()
+        X = self.transform(records)
+        transformed = perf_counter()
+        probabilities = self.model.predict_proba(X)
+
+        model_stage_duration.observe(transformed - started, 'preprocess')
+        model_stage_duration.observe(perf_counter() - transformed, 'predict_proba')
+        model_rows.inc(len(records))
+        return probabilities
+
+    def predict_top(self, records, k=3):
+        """Ranked [{"role", "score"}] lists (score in %), one per record."""
+        probabilities = self.predict_proba(records)
+        top_indices = np.argsort(probabilities, axis=1)[:, -k:][:, ::-1]
+        classes = self.classes_
+        return [
+            rank_roles(probabilities[row], top_indices[row], classes)
+            for row in range(len(records))
+        ]
+
+    @staticmethod
+    def profile_record(profile):
+        """UserProfile (or a serialized profile dict) -> input record."""
+        get = profile.get if isinstance(profile, dict) else functools.partial(getattr, profile)
+        cgpa = get('cgpa')
+        return {
+            'highest_degree': get('highest_degree'),
+            'branch': get('branch'),
+            'cgpa': cgpa if cgpa is not None else 0.0,
+            'skills': get('skills') or "",
+        }
@@ -1,22 +1,18 @@
 # backend/predictions/preprocessing.py
 
-import numpy as np
-import joblib
-import os
-from django.conf import settings
+from .features import category_lookup, transform_features
 
 class EducationPreprocessor:
-    def __init__(self):
-        # Path to your saved ML artifacts
-        # We assume these were saved during training in 'backend/ml_models/'
-        model_path = os.path.join(settings.BASE_DIR, 'ml_models')
-        
-        try:
-            self.le_degree = joblib.load(os.path.join(model_path, 'le_degree.pkl'))
-            self.le_branch = joblib.load(os.path.join(model_path, 'le_branch.pkl'))
-            self.tfidf = joblib.load(os.path.join(model_path, 'tfidf.pkl'))
-        except FileNotFoundError:
-            print("⚠️ Warning: Encoder files not found. Ensure train_model.py has run.")
+    def __init__(self, le_degree, le_branch, tfidf):
+        # Fitted encoders come from the model registry (predictions/registry.py),
+        # which loads them once per worker instead of once per request.
+        self.le_degree = le_degree
+        self.le_branch = le_branch
+        self.tfidf = tfidf
+
+        # Label -> code lookups (unseen labels map to 0)
+        self._degree_codes = category_lookup(le_degree)
+        self._branch_codes = category_lookup(le_branch)
 
     def validate_input(self, data):
         """
@@ -45,33 +41,40 @@ class EducationPreprocessor:
         """
         Requirements: Data encoding and normalization
         """
-        degree = data.get('highest_degree')
-        branch = data.get('branch')
-        cgpa = float(data.get('cgpa'))
-        skills = data.get('skills')
-
-        # --- A. Data Encoding (Label Encoding) ---
-        # Converts "B.Tech" -> 0, "M.Tech" -> 1, etc.
-        try:
-            # Helper to handle unseen labels safely
-            degree_encoded = self.le_degree.transform([degree])[0] if degree in self.le_degree.classes_ else 0
-        except:
-            degree_encoded = 0
+        # Same code path as a batch of one (see predictions/features.py):
+        # A. Label encoding  ("B.Tech" -> 0, "M.Tech" -> 1, ...)
+        # B. TF-IDF on skills ("Python, Java" -> [0.1, 0.5, 0.0, ...])
+        # C. Stack [Degree, Branch, CGPA] + [Skills Vector] as sparse CSR
+        return self.preprocess_many([data])
 
-        try:
-            branch_encoded = self.le_branch.transform([branch])[0] if branch in self.le_branch.classes_ else 0
-        except:
-            branch_encoded = 0
-
-        # --- B. Feature Normalization (Vectorization) ---
-        # Converts "Python, Java" -> [0.1, 0.5, 0.0, ...]
-        skills_vectorized = self.tfidf.transform([skills]).toarray()
-
-        # --- C. Feature Stacking ---
-        # Combine [Degree, Branch, CGPA] + [Skills Vector]
-        features = np.hstack((
-            [[degree_encoded, branch_encoded, cgpa]], 
-            skills_vectorized
-        ))
+    def validate_many(self, records):
+        """
+        Runs validate_input() on every record.
+        Returns (valid_indices, errors) where errors maps index -> message.
+        """
+        valid_indices, errors = [], {}
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                errors[index] = "Each profile must be a JSON object."
+                continue
+            is_valid, message = self.validate_input(record)
+            if is_valid:
+                valid_indices.append(index)
+            else:
+                errors[index] = message
+        return valid_indices, errors
 
-        return features
\ No newline at end of file
+    def preprocess_many(self, records):
+        """
+        Batch version of preprocess(): one tfidf.transform and one sparse
+        hstack for the whole list of (already validated) records.
+        """
+        return transform_features(
+            [r.get('highest_degree') for r in records],
+            [r.get('branch') for r in records],
+            [float(r.get('cgpa')) for r in records],
+            [r.get('skills') for r in records],
+            self._degree_codes,
+            self._branch_codes,
+            self.tfidf,
+        )
@@ -0,0 +1,169 @@
+# backend/predictions/realtime.py
+#
+# In-process pub/sub hub for group chat push.
+#
+# WebSocket connections (predictions/consumers.py) subscribe to a group and
+# get an asyncio.Queue. New GroupMessage rows are published from whatever
+# thread saved them; delivery hops onto each subscriber's event loop with
+# call_soon_threadsafe, so sync views and async sockets can share one hub.
+#
+# Single process: the hub alone is enough.
+# Several processes: set CHAT_REDIS_URL (any Redis-protocol server works;
+# a redis:// CACHE_URL is used by default) and every process relays
+# published messages through one Redis channel. gunicorn.conf.py falls back
+# to one worker when there is no Redis.
+
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+
+CHANNEL_PREFIX = 'edu2job:chat:group:'
+
+
+class ChatHub:
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = {}  # group_id -> {(loop, queue), ...}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, group_id):
+        """Must be called from the subscriber's running event loop."""
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(str(group_id), set()).add(entry)
+        return entry
+
+    def unsubscribe(self, group_id, entry):
+        with self._lock:
+            subscribers = self._subscribers.get(str(group_id))
+            if subscribers:
+                subscribers.discard(entry)
+                if not subscribers:
+                    del self._subscribers[str(group_id)]
+
+    def subscriber_count(self, group_id=None):
+        with self._lock:
+            if group_id is not None:
+                return len(self._subscribers.get(str(group_id), ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+    def _offer(self, queue, payload):
+        try:
+            queue.put_nowait(payload)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            # Slow client: drop rather than grow without bound; it can resync with since_id
+            self.dropped += 1
+
+    def deliver_local(self, group_id, payload):
+        """Fan a payload out to subscribers in this process. Thread-safe."""
+        with self._lock:
+            targets = list(self._subscribers.get(str(group_id), ()))
+        for loop, queue in targets:
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(self._offer, queue, payload)
+
+    def publish(self, group_id, payload):
+        """Send to every subscriber of the group, in all processes if Redis is configured."""
+        self.published += 1
+        relay = redis_relay()
+        if relay is not None and relay.publish(group_id, payload):
+            return
+        self.deliver_local(group_id, payload)
+
+    def stats(self):
+        return {
+            "subscribers": self.subscriber_count(),
+            "groups": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "redis": redis_relay() is not None,
+        }
+
+
+chat_hub = ChatHub()
+
+
+# ==========================================
+# Optional multi-process relay (Redis protocol)
+# ==========================================
+
+class RedisRelay:
+    """
+    Publishes to Redis and runs one background listener thread per process
+    that feeds incoming messages into the local hub.
+    """
+
+    def __init__(self, url, hub):
+        import redis  # Optional dependency: pip install redis
+
+        self.hub = hub
+        self.client = redis.Redis.from_url(url)
+        self._listener = None
+        self._start_lock = threading.Lock()
+
+    def publish(self, group_id, payload):
+        self.ensure_listener()
+        try:
+            self.client.publish(CHANNEL_PREFIX + str(group_id), json.dumps(payload, default=str))
+            return True
+        except Exception as e:
+            print("Chat Relay Error:", e)
+            return False
+
+    def ensure_listener(self):
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._start_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='chat-redis-relay', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(CHANNEL_PREFIX + '*')
+        for message in pubsub.listen():
+            try:
+                channel = message['channel'].decode()
+                group_id = channel[len(CHANNEL_PREFIX):]
+                self.hub.deliver_local(group_id, json.loads(message['data']))
+            except Exception as e:
+                print("Chat Relay Error:", e)
+
+
+_relay = None
+_relay_checked = False
+_relay_lock = threading.Lock()
+
+
+def redis_relay():
+    """The process's RedisRelay, or None when CHAT_REDIS_URL is unset/unusable."""
+    global _relay, _relay_checked
+    if _relay_checked:
+        return _relay
+    with _relay_lock:
+        if not _relay_checked:
+            url = getattr(settings, 'CHAT_REDIS_URL', '')
+            if url:
+                try:
+                    _relay = RedisRelay(url, chat_hub)
+                except ImportError:
+                    print("⚠️ Warning: CHAT_REDIS_URL is set but the 'redis' package is not installed; "
+                          "chat push stays in-process.")
+            _relay_checked = True
+    return _relay
+
+
+def ensure_relay_listening():
+    """Start the Redis listener early so a process that only has sockets still receives."""
+    relay = redis_relay()
+    if relay is not None:
+        relay.ensure_listener()
@@ -0,0 +1,309 @@
+# backend/predictions/registry.py
+
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+
+from .compact import COMPACT_DIR, UnsupportedModel, compact_paths, export_compact, has_compact, load_compact
+from .predictor import LEGACY_FILES, PREDICTOR_FILE, Predictor
+
+# Layout under backend/ml_models/:
+#   versions/<version>/predictor.joblib -> one complete Predictor per retrain
+#   versions/<version>/compact/         -> the same model as mmap-able arrays (predictions/compact.py)
+#   CURRENT                             -> name of the live version (swapped atomically)
+# A tree without CURRENT falls back to the flat legacy *.pkl files in ml_models/ itself.
+VERSIONS_DIR = 'versions'
+POINTER_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+LEGACY_VERSION = 'legacy'
+
+
+def default_model_dir():
+    return getattr(settings, 'ML_MODEL_DIR', os.path.join(settings.BASE_DIR, 'ml_models'))
+
+
+def read_current_version(model_dir):
+    """Version named by the CURRENT pointer, or None for the legacy flat layout."""
+    try:
+        with open(os.path.join(model_dir, POINTER_FILE)) as fh:
+            return fh.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_version_dir(model_dir, version):
+    if version is None or version == LEGACY_VERSION:
+        return str(model_dir)
+    return os.path.join(model_dir, VERSIONS_DIR, version)
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, 'w') as fh:
+        fh.write(text)
+        fh.flush()
+        os.fsync(fh.fileno())
+    # os.replace is atomic on POSIX: readers see either the old or the new file
+    os.replace(tmp_path, path)
+
+
+def publish_bundle(predictor, model_dir=None, metadata=None, keep=None):
+    """
+    Write a fitted Predictor into a fresh version directory, then flip
+    CURRENT to it. Workers never see a half-written bundle because the
+    pointer only moves once every file is on disk.
+
+    Returns the new version name.
+    """
+    model_dir = str(model_dir or default_model_dir())
+    versions_root = os.path.join(model_dir, VERSIONS_DIR)
+    os.makedirs(versions_root, exist_ok=True)
+
+    version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+    staging_dir = os.path.join(versions_root, f".staging-{version}-{os.getpid()}")
+    os.makedirs(staging_dir)
+
+    predictor.metadata.update(metadata or {}, version=version)
+    predictor.save(os.path.join(staging_dir, PREDICTOR_FILE))
+    write_compact(predictor, staging_dir)
+
+    manifest = {"version": version, "created_at": time.time(), **(metadata or {})}
+    with open(os.path.join(staging_dir, MANIFEST_FILE), 'w') as fh:
+        json.dump(manifest, fh, indent=2, default=str)
+
+    os.rename(staging_dir, os.path.join(versions_root, version))
+    _write_atomic(os.path.join(model_dir, POINTER_FILE), version)
+
+    prune_versions(model_dir, keep=keep)
+    return version
+
+
+def write_compact(predictor, model_dir):
+    """Add the compact export next to predictor.joblib; joblib stays the fallback."""
+    if not getattr(settings, 'ML_MODEL_COMPACT_EXPORT', True):
+        return False
+    try:
+        export_compact(predictor, os.path.join(model_dir, COMPACT_DIR))
+    except UnsupportedModel as e:
+        print("Compact Export Skipped:", e)
+        return False
+    return True
+
+
+def prune_versions(model_dir, keep=None):
+    """Delete old bundles, keeping the newest `keep` plus whatever CURRENT names."""
+    if keep is None:
+        keep = getattr(settings, 'ML_MODEL_KEEP_VERSIONS', 3)
+    versions_root = os.path.join(model_dir, VERSIONS_DIR)
+    if not os.path.isdir(versions_root):
+        return
+
+    current = read_current_version(model_dir)
+    versions = sorted(
+        name for name in os.listdir(versions_root) if not name.startswith('.')
+    )
+    for name in versions[:-keep] if keep > 0 else versions:
+        if name != current:
+            shutil.rmtree(os.path.join(versions_root, name), ignore_errors=True)
+
+
+def _current_rss_bytes():
+    """Resident set size of this process (Linux only, None elsewhere)."""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """
+    One loaded Predictor plus how it got here.
+    Frozen so a request can hold on to it while the registry moves on.
+    """
+    predictor: Predictor
+    version: str
+    model_format: str
+    source_dir: str
+    loaded_at: float
+    load_seconds: float
+    artifact_bytes: int
+    rss_delta_bytes: int | None
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "model_format": self.model_format,
+            "source_dir": self.source_dir,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+            "artifact_bytes": self.artifact_bytes,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "n_features": self.predictor.n_features,
+            "n_classes": len(self.predictor.classes_),
+        }
+
+
+def load_bundle(model_dir, version=None, model_format=None):
+    """
+    Load model_dir into a fresh ModelBundle. model_format 'compact'
+    (default: ML_MODEL_FORMAT) memory-maps the compact export when there is
+    one; 'joblib' always unpickles a full sklearn Predictor (needed to keep
+    training it).
+    """
+    if model_format is None:
+        model_format = getattr(settings, 'ML_MODEL_FORMAT', 'compact')
+    rss_before = _current_rss_bytes()
+    started = time.perf_counter()
+
+    predictor_path = os.path.join(model_dir, PREDICTOR_FILE)
+    predictor = None
+    if model_format == 'compact' and has_compact(model_dir):
+        try:
+            predictor = load_compact(model_dir)
+            paths = compact_paths(model_dir)
+        except UnsupportedModel as e:
+            # e.g. an export in an older format; re-export with export_compact_model
+            print("Compact Load Skipped:", e)
+    if predictor is not None:
+        model_format = 'compact'
+    elif os.path.exists(predictor_path):
+        model_format = 'joblib'
+        paths = [predictor_path]
+        predictor = Predictor.load(predictor_path)
+    else:
+        model_format = 'legacy'
+        paths = [os.path.join(model_dir, name) for name in LEGACY_FILES.values()]
+        predictor = Predictor.from_legacy_dir(model_dir)
+
+    load_seconds = time.perf_counter() - started
+    rss_after = _current_rss_bytes()
+
+    return ModelBundle(
+        predictor=predictor,
+        version=version or LEGACY_VERSION,
+        model_format=model_format,
+        source_dir=str(model_dir),
+        loaded_at=time.time(),
+        load_seconds=load_seconds,
+        artifact_bytes=sum(os.path.getsize(p) for p in paths),
+        rss_delta_bytes=(rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+    )
+
+
+class ModelRegistry:
+    """
+    Process-wide holder for the prediction artifacts.
+
+    The first request in a worker loads the pickles; every later request
+    (in any thread) gets the same ModelBundle reference without touching disk.
+
+    Hot swap: at most every ML_MODEL_POLL_SECONDS a request stats the CURRENT
+    pointer. If it moved, a background thread loads the new version and swaps
+    the reference; requests keep using the old bundle until then.
+    """
+
+    def __init__(self, model_dir=None, poll_seconds=None):
+        self._model_dir = model_dir
+        self._poll_seconds = poll_seconds
+        self._bundle = None
+        self._lock = threading.Lock()
+        self._load_count = 0
+        self._last_check = 0.0
+        self._pointer_mtime = None
+        self._reloading = False
+        self._last_error = None
+
+    @property
+    def model_dir(self):
+        return str(self._model_dir or default_model_dir())
+
+    @property
+    def poll_seconds(self):
+        if self._poll_seconds is not None:
+            return self._poll_seconds
+        return getattr(settings, 'ML_MODEL_POLL_SECONDS', 5)
+
+    def _pointer_stat(self):
+        try:
+            return os.stat(os.path.join(self.model_dir, POINTER_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load_current(self):
+        pointer_mtime = self._pointer_stat()
+        version = read_current_version(self.model_dir)
+        bundle = load_bundle(resolve_version_dir(self.model_dir, version), version=version)
+        return bundle, pointer_mtime
+
+    def get(self):
+        bundle = self._bundle
+        if bundle is not None:
+            self._maybe_schedule_reload()
+            return bundle
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if self._bundle is None:
+                self._bundle, self._pointer_mtime = self._load_current()
+                self._last_check = time.monotonic()
+                self._load_count += 1
+            return self._bundle
+
+    def _maybe_schedule_reload(self):
+        now = time.monotonic()
+        if now - self._last_check < self.poll_seconds or self._reloading:
+            return
+        self._last_check = now
+
+        if self._pointer_stat() == self._pointer_mtime:
+            return
+
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, name='model-registry-reload', daemon=True).start()
+
+    def _reload(self):
+        try:
+            bundle, pointer_mtime = self._load_current()
+            with self._lock:
+                self._bundle = bundle
+                self._pointer_mtime = pointer_mtime
+                self._load_count += 1
+                self._last_error = None
+        except Exception as e:
+            # Keep serving the old bundle; try again on the next poll
+            print("Model Reload Error:", e)
+            self._last_error = str(e)
+        finally:
+            self._reloading = False
+
+    def reset(self):
+        """Drop the cached bundle; the next get() reloads from disk."""
+        with self._lock:
+            self._bundle = None
+            self._pointer_mtime = None
+
+    def stats(self):
+        bundle = self._bundle
+        return {
+            "loaded": bundle is not None,
+            "load_count": self._load_count,
+            "pid": os.getpid(),
+            "current_version": read_current_version(self.model_dir) or LEGACY_VERSION,
+            "reloading": self._reloading,
+            "last_error": self._last_error,
+            "bundle": bundle.stats() if bundle else None,
+        }
+
+
+model_registry = ModelRegistry()
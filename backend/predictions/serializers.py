@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import JobPrediction, TrainingData, StudyGroup, GroupMessage
+from .models import JobPrediction, TrainingData, StudyGroup, GroupMessage, RetrainJob
 
 # 1. Prediction Data Serializer
 class JobPredictionSerializer(serializers.ModelSerializer):
@@ -17,19 +17,28 @@ class TrainingDataSerializer(serializers.ModelSerializer):
 class CSVUploadSerializer(serializers.Serializer):
     file = serializers.FileField()
 
-# --- 4. NEW CHAT SERIALIZERS (ADDED) ---
+# 4. Background Retrain Job Status
+class RetrainJobSerializer(serializers.ModelSerializer):
+    elapsed_seconds = serializers.FloatField(read_only=True)
+    is_finished = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = RetrainJob
+        fields = [
+            'id', 'status', 'mode', 'progress', 'stage', 'row_count', 'metrics', 'error',
+            'created_at', 'started_at', 'finished_at', 'elapsed_seconds', 'is_finished',
+        ]
+
+# --- 5. NEW CHAT SERIALIZERS (ADDED) ---
 
 class StudyGroupSerializer(serializers.ModelSerializer):
-    # Members count ni future lo dynamic cheyochu, ippatiki dummy/calc pettachu
-    members_count = serializers.SerializerMethodField()
+    # Counters are columns on StudyGroup (kept current by predictions/signals.py)
 
     class Meta:
         model = StudyGroup
-        fields = ['id', 'name', 'description', 'members_count', 'created_at']
-
-    def get_members_count(self, obj):
-        # Example: Count distinct users who messaged in this group
-        return obj.messages.values('user').distinct().count()
+        fields = ['id', 'name', 'description', 'members_count', 'messages_count',
+                  'last_activity_at', 'created_at']
+        read_only_fields = ['members_count', 'messages_count', 'last_activity_at']
 
 class GroupMessageSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username') # User ID kakunda User Name vastundi
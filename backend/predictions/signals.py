@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import GroupMembership, GroupMessage, StudyGroup
+from .realtime import chat_hub
+from .serializers import GroupMessageSerializer
+
+# bulk_create() and COPY skip post_save. Code that inserts that way sends
+# this instead, with either `objs` (saved instances) or `frame` (DataFrame).
+bulk_created = Signal()
+
+
+# --- A. Denormalized StudyGroup counters ---
+# F() updates run in the caller's transaction, so the counters commit (or
+# roll back) together with the row that changed them. Message/group writes
+# in views and the chat socket are wrapped in transaction.atomic().
+
+@receiver(post_save, sender=StudyGroup)
+def add_creator_as_member(sender, instance, created, **kwargs):
+    if created and instance.created_by_id:
+        GroupMembership.objects.get_or_create(group_id=instance.pk, user_id=instance.created_by_id)
+
+
+@receiver(post_save, sender=GroupMembership)
+def count_new_member(sender, instance, created, **kwargs):
+    if created:
+        StudyGroup.objects.filter(pk=instance.group_id).update(members_count=F('members_count') + 1)
+
+
+@receiver(post_delete, sender=GroupMembership)
+def count_removed_member(sender, instance, **kwargs):
+    StudyGroup.objects.filter(pk=instance.group_id, members_count__gt=0).update(
+        members_count=F('members_count') - 1
+    )
+
+
+@receiver(post_save, sender=GroupMessage)
+def count_new_message(sender, instance, created, **kwargs):
+    if not created:
+        return
+    # Posting in a group makes you a member
+    GroupMembership.objects.get_or_create(group_id=instance.group_id, user_id=instance.user_id)
+    StudyGroup.objects.filter(pk=instance.group_id).update(
+        messages_count=F('messages_count') + 1,
+        last_activity_at=instance.created_at,
+    )
+
+
+@receiver(post_delete, sender=GroupMessage)
+def count_removed_message(sender, instance, **kwargs):
+    StudyGroup.objects.filter(pk=instance.group_id, messages_count__gt=0).update(
+        messages_count=F('messages_count') - 1
+    )
+
+
+# --- B. Realtime push ---
+
+@receiver(post_save, sender=GroupMessage)
+def push_new_message(sender, instance, created, **kwargs):
+    """Push new chat messages to WebSocket subscribers once the row is committed."""
+    if not created:
+        return
+    payload = dict(GroupMessageSerializer(instance).data)
+    transaction.on_commit(lambda: chat_hub.publish(instance.group_id, payload))
@@ -0,0 +1,58 @@
+# backend/predictions/streaming.py
+#
+# Out-of-core training input. TrainingData is read with values_list() over
+# only the columns training uses, through a server-side cursor
+# (QuerySet.iterator on PostgreSQL), and handed out as typed NumPy chunks
+# of ML_STREAM_CHUNK_ROWS rows. Nothing holds more than one chunk of raw
+# rows, whatever the table size.
+
+from dataclasses import dataclass
+from itertools import islice
+
+import numpy as np
+from django.conf import settings
+
+from .features import FEATURE_DTYPE
+
+CHUNK_COLUMNS = ('degree', 'branch', 'cgpa', 'skills', 'job_role')
+
+
+@dataclass(frozen=True)
+class TrainingChunk:
+    degree: np.ndarray    # object (str)
+    branch: np.ndarray    # object (str)
+    cgpa: np.ndarray      # float32
+    skills: np.ndarray    # object (str)
+    job_role: np.ndarray  # object (str)
+
+    def __len__(self):
+        return len(self.cgpa)
+
+
+def _to_chunk(rows):
+    degree, branch, cgpa, skills, job_role = zip(*rows)
+    return TrainingChunk(
+        degree=np.array(degree, dtype=object),
+        branch=np.array(branch, dtype=object),
+        cgpa=np.fromiter(cgpa, dtype=FEATURE_DTYPE, count=len(rows)),
+        skills=np.array(skills, dtype=object),
+        job_role=np.array(job_role, dtype=object),
+    )
+
+
+def iter_training_chunks(queryset, chunk_size=None):
+    """Yield TrainingChunks of at most `chunk_size` rows, in queryset order."""
+    chunk_size = chunk_size or getattr(settings, 'ML_STREAM_CHUNK_ROWS', 10000)
+    # chunk_size is also the cursor fetch size, so the driver buffers one chunk too
+    rows = queryset.values_list(*CHUNK_COLUMNS).iterator(chunk_size=chunk_size)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        yield _to_chunk(batch)
+
+
+def distinct_values(queryset, column):
+    """Sorted distinct values of one column, computed by the database."""
+    # Sorted in Python so the order matches LabelEncoder, whatever the DB collation
+    return sorted(queryset.order_by().values_list(column, flat=True).distinct())
@@ -0,0 +1,133 @@
+import io
+import os
+import queue
+import tempfile
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase
+
+from adminpanel import rollups
+from adminpanel.models import RollupMetric
+
+from .benchmarks import synthetic_training_frame
+from .compact import COMPACT_DIR, export_compact, load_compact
+from .features import category_lookup, fit_transform_features, hashing_vectorizer, transform_features
+from .predictor import Predictor
+from .ingestion import ingest_training_csv
+from .models import JobPrediction, TrainingData
+from .training import build_classifier, build_streaming_model, fit_forest
+from .writebehind import WriteBehindBuffer
+
+
+def as_records(df):
+    return [
+        {'highest_degree': d, 'branch': b, 'cgpa': c, 'skills': s}
+        for d, b, c, s in zip(df['degree'], df['branch'], df['cgpa'], df['skills'])
+    ]
+
+
+class CompactForestTests(SimpleTestCase):
+    """The mmap artifact must give users exactly the scores the joblib model gives."""
+
+    @classmethod
+    def build_predictor(cls, df):
+        le_degree, le_branch, tfidf, X = fit_transform_features(df['degree'], df['branch'], df['cgpa'], df['skills'])
+        clf = build_classifier(X.shape[0], n_estimators=30, random_state=0)
+        fit_forest(clf, X, df['job_role'])
+        return Predictor(clf, le_degree, le_branch, tfidf)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        df = synthetic_training_frame(3000, vocabulary_size=300, n_roles=8, seed=1)
+        cls.predictor = cls.build_predictor(df)
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        export_compact(cls.predictor, os.path.join(cls.tmp.name, COMPACT_DIR))
+        cls.compact = load_compact(cls.tmp.name)
+
+        cls.records = as_records(synthetic_training_frame(2000, vocabulary_size=300, n_roles=8, seed=2))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+        super().tearDownClass()
+
+    def test_probabilities_are_identical(self):
+        np.testing.assert_array_equal(
+            self.predictor.predict_proba(self.records), self.compact.predict_proba(self.records),
+        )
+
+    def test_scores_are_identical(self):
+        self.assertEqual(self.predictor.predict_top(self.records), self.compact.predict_top(self.records))
+
+
+class CompactLinearTests(CompactForestTests):
+    """Same checks for the streaming trainer's MaxAbsScaler + SGD model."""
+
+    @classmethod
+    def build_predictor(cls, df):
+        le_degree, le_branch, _, _ = fit_transform_features(df['degree'], df['branch'], df['cgpa'], df['skills'])
+        vectorizer = hashing_vectorizer(1024)
+        X = transform_features(
+            df['degree'], df['branch'], df['cgpa'], df['skills'],
+            category_lookup(le_degree), category_lookup(le_branch),
+            vectorizer,
+        )
+        model = build_streaming_model()
+        X = model.named_steps['scale'].fit_transform(X)
+        model.named_steps['clf'].fit(X, df['job_role'])
+        return Predictor(model, le_degree, le_branch, vectorizer)
+
+
+class WriteBehindTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='wb@example.com', username='wb', password='x')
+        # flush() writes in the calling thread, so no worker is started
+        self.buffer = WriteBehindBuffer(JobPrediction)
+        self.buffer._queue = queue.Queue()
+
+    def submit(self, n):
+        for i in range(n):
+            self.buffer._queue.put(JobPrediction(user=self.user, predicted_role='Dev', confidence_score=i))
+
+    def test_bulk_insert_counts_rows_once(self):
+        before = rollups.total(RollupMetric.PREDICTIONS)
+        self.submit(3)
+        self.assertTrue(self.buffer.flush())
+        self.assertEqual(rollups.total(RollupMetric.PREDICTIONS) - before, 3)
+
+    def test_row_by_row_fallback_counts_rows_once(self):
+        before = rollups.total(RollupMetric.PREDICTIONS)
+        before_role = rollups.total(RollupMetric.ROLE, 'Dev')
+        self.submit(3)
+        with mock.patch.object(JobPrediction.objects, 'bulk_create', side_effect=DatabaseError('down')):
+            self.assertTrue(self.buffer.flush())
+        self.assertEqual(JobPrediction.objects.count(), 3)
+        self.assertEqual(rollups.total(RollupMetric.PREDICTIONS) - before, 3)
+        self.assertEqual(rollups.total(RollupMetric.ROLE, 'Dev') - before_role, 3)
+
+
+class IngestionTests(TestCase):
+
+    def test_malformed_lines_are_reported_as_rejected(self):
+        csv = (
+            "degree,branch,cgpa,skills,job_role\n"   # line 1
+            "B.Tech,CSE,8.1,Python,Developer\n"      # 2
+            "B.Tech,CSE,7,Java,Developer,extra\n"    # 3: too many fields
+            "MBA,Finance,abc,Excel,Analyst\n"        # 4: bad cgpa
+            "MBA,Finance,6.5,Excel,Analyst\n"        # 5
+            "B.Sc,Maths,9,R,Analyst,x,y\n"           # 6: too many fields
+            "B.Sc,Maths,9,R,Analyst\n"               # 7
+        )
+        report = ingest_training_csv(io.BytesIO(csv.encode()), chunk_rows=2)
+
+        self.assertIsNone(report['failed'])
+        self.assertEqual((report['accepted'], report['rejected']), (3, 3))
+        self.assertEqual(TrainingData.objects.count(), 3)
+        self.assertEqual([line for chunk in report['chunks'] for line in chunk['bad_lines']], [3, 6])
+        self.assertEqual(sum(chunk['rows'] for chunk in report['chunks']), 6)
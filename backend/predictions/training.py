@@ -0,0 +1,611 @@
+# backend/predictions/training.py
+
+import time
+from contextlib import nullcontext
+from itertools import islice
+
+import joblib
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db.models import Max
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, MaxAbsScaler
+
+from .features import (
+    DEFAULT_HASH_FEATURES,
+    DEFAULT_MAX_FEATURES,
+    fit_transform_features,
+    hashing_vectorizer,
+    transform_features,
+)
+from .models import TrainingData
+from .predictor import Predictor
+from .registry import default_model_dir, load_bundle, publish_bundle, read_current_version, resolve_version_dir
+from .streaming import distinct_values, iter_training_chunks
+
+MODE_FULL = 'full'
+MODE_INCREMENTAL = 'incremental'
+# Out-of-core: hashed skills + SGD, fed chunk by chunk from the database
+MODE_STREAMING = 'streaming'
+
+# Columns the trainer reads; `id` is only used for the high-water mark
+TRAINING_COLUMNS = ('id', 'degree', 'branch', 'cgpa', 'skills', 'job_role')
+# Numeric columns are kept as typed arrays (8 bytes a value, not a Python object)
+NUMERIC_COLUMNS = {'id': np.int64, 'cgpa': np.float64}
+
+# ML_TRAIN_BACKEND -> joblib backend
+BACKENDS = {'threads': 'threading', 'processes': 'loky'}
+
+# Rough working set of one tree being grown, per bootstrap sample (sample
+# weights, index and feature buffers of the sparse splitter)
+TREE_BYTES_PER_SAMPLE = 64
+# Fixed part of one tree node (sklearn's Node struct); the value array adds 8 bytes per class
+TREE_NODE_BYTES = 64
+
+
+class NoTrainingData(Exception):
+    pass
+
+
+def _noop_progress(percent, stage, rows=None):
+    pass
+
+
+# ==========================================
+# Training engine (parallelism + memory)
+# ==========================================
+
+def available_cpus():
+    """Cores this process may use (affinity / cgroup quota aware)."""
+    return max(joblib.cpu_count(), 1)
+
+
+def resolve_max_samples(value, n_samples):
+    """ML_RF_MAX_SAMPLES: None/0 = full bootstrap, <= 1 a fraction, > 1 a row count."""
+    if not value:
+        return None
+    if value <= 1:
+        return float(value)
+    return min(int(value), n_samples)
+
+
+def _drawn_samples(n_samples, max_samples):
+    if max_samples is None:
+        return n_samples
+    if isinstance(max_samples, float):
+        return max(int(round(n_samples * max_samples)), 1)
+    return max_samples
+
+
+def _matrix_bytes(X):
+    if sparse.issparse(X):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return X.nbytes
+
+
+def plan_parallelism(X, n_classes, n_trees, max_samples=None, n_jobs=None, backend=None,
+                     memory_limit_mb=None):
+    """
+    How many trees to grow at once. Starts from ML_TRAIN_N_JOBS (0 = every
+    available core) and lowers it until the estimated peak fits under
+    ML_TRAIN_MEMORY_LIMIT_MB:
+
+      base       = X + the CSC copy the forest makes of it + the finished
+                   trees (about one node per drawn sample each)
+      per worker = one tree's working set (+ X again with processes, whose
+                   RSS counts the memory-mapped copy they read)
+
+    Only the per-worker part depends on n_jobs; when the trees alone don't
+    fit, lower ML_RF_MAX_SAMPLES. Returns a dict (also reported in metrics).
+    """
+    if n_jobs is None:
+        n_jobs = getattr(settings, 'ML_TRAIN_N_JOBS', 0)
+    if backend is None:
+        backend = getattr(settings, 'ML_TRAIN_BACKEND', 'threads')
+    if memory_limit_mb is None:
+        memory_limit_mb = getattr(settings, 'ML_TRAIN_MEMORY_LIMIT_MB', 0)
+    if backend not in BACKENDS:
+        raise ValueError(f"ML_TRAIN_BACKEND must be one of {sorted(BACKENDS)}")
+
+    cpus = available_cpus()
+    if n_jobs <= 0:
+        n_jobs = cpus
+    n_jobs = max(min(n_jobs, cpus, n_trees), 1)
+
+    drawn = _drawn_samples(X.shape[0], max_samples)
+    x_bytes = _matrix_bytes(X)
+    trees_bytes = n_trees * drawn * (TREE_NODE_BYTES + 8 * n_classes)
+    base_bytes = 2 * x_bytes + trees_bytes
+    worker_bytes = drawn * TREE_BYTES_PER_SAMPLE
+    if backend == 'processes':
+        worker_bytes += x_bytes
+
+    if memory_limit_mb:
+        budget = memory_limit_mb * 2**20 - base_bytes
+        fits = max(int(budget // worker_bytes), 1)
+        if fits < n_jobs:
+            print(f"Training: capping n_jobs {n_jobs} -> {fits} to stay under {memory_limit_mb} MB")
+            n_jobs = fits
+        if budget < worker_bytes:
+            print(f"Training Warning: data + trees need ~{base_bytes / 2**20:.0f} MB, over "
+                  f"ML_TRAIN_MEMORY_LIMIT_MB={memory_limit_mb}; lower ML_RF_MAX_SAMPLES")
+
+    return {
+        "n_jobs": n_jobs,
+        "backend": backend,
+        "cpus": cpus,
+        "estimated_peak_mb": round((base_bytes + n_jobs * worker_bytes) / 2**20, 1),
+    }
+
+
+def build_classifier(n_samples, n_estimators=None, max_samples=None, random_state=None):
+    if n_estimators is None:
+        n_estimators = getattr(settings, 'ML_RF_N_ESTIMATORS', 100)
+    if max_samples is None:
+        max_samples = getattr(settings, 'ML_RF_MAX_SAMPLES', None)
+    return RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_samples=resolve_max_samples(max_samples, n_samples),
+        random_state=random_state,
+    )
+
+
+def fit_forest(clf, X, y, sample_weight=None, plan=None):
+    """
+    Fit `clf` with the planned n_jobs/backend, then put n_jobs back to None:
+    the published model predicts one request at a time and must not fan
+    out over every core.
+    """
+    if plan is None:
+        existing = len(getattr(clf, 'estimators_', ())) if clf.warm_start else 0
+        plan = plan_parallelism(
+            X, n_classes=len(np.unique(y)), n_trees=clf.n_estimators - existing, max_samples=clf.max_samples,
+        )
+    clf.set_params(n_jobs=plan["n_jobs"])
+    # Threads share X (tree building releases the GIL); processes isolate
+    # each worker's memory at the cost of mapping X into every worker
+    context = (
+        joblib.parallel_config(backend=BACKENDS[plan["backend"]])
+        if plan["n_jobs"] > 1 else nullcontext()
+    )
+    try:
+        with context:
+            clf.fit(X, y, sample_weight=sample_weight)
+    finally:
+        clf.set_params(n_jobs=None)
+    return plan
+
+
+def fit_predictor(df, progress=None):
+    """
+    Fit encoders + Random Forest on a TrainingData-shaped DataFrame
+    (degree, branch, cgpa, skills, job_role). Returns (Predictor, metrics).
+    Used by retraining and by the train_model.py CLI.
+    """
+    progress = progress or _noop_progress
+
+    # Shared sparse feature builder (predictions/features.py), same layout as inference
+    skill_encoder = getattr(settings, 'ML_SKILLS_ENCODER', 'tfidf')
+    le_degree, le_branch, vectorizer, X = fit_transform_features(
+        df['degree'], df['branch'], df['cgpa'], df['skills'],
+        max_features=getattr(settings, 'ML_TFIDF_MAX_FEATURES', DEFAULT_MAX_FEATURES),
+        skill_encoder=skill_encoder,
+        hash_features=getattr(settings, 'ML_SKILLS_HASH_FEATURES', DEFAULT_HASH_FEATURES),
+    )
+    y = df['job_role']
+
+    # Train Random Forest
+    progress(40, "training model")
+    fit_started = time.perf_counter()
+    clf = build_classifier(X.shape[0])
+    plan = fit_forest(clf, X, y)
+    fit_seconds = time.perf_counter() - fit_started
+
+    progress(85, "evaluating")
+    train_accuracy = float(clf.score(X, y))
+
+    metrics = {
+        "rows": len(df),
+        "n_features": int(X.shape[1]),
+        "n_classes": len(clf.classes_),
+        "train_accuracy": round(train_accuracy, 4),
+        "fit_seconds": round(fit_seconds, 3),
+        "n_estimators": clf.n_estimators,
+        "n_jobs": plan["n_jobs"],
+        "backend": plan["backend"],
+        "skills_encoder": skill_encoder,
+        # Baseline for the out-of-vocabulary check in incremental_retrain()
+        "skills_oov_share": round(oov_share(vectorizer, df['skills']), 4),
+    }
+    predictor = Predictor(clf, le_degree, le_branch, vectorizer)
+    return predictor, metrics
+
+
+def oov_share(tfidf, skills):
+    """Share of skill tokens that are not in the fitted vocabulary."""
+    if not hasattr(tfidf, 'vocabulary_'):
+        # Hashing: every token lands in some column
+        return 0.0
+    analyzer = tfidf.build_analyzer()
+    vocabulary = tfidf.vocabulary_
+    total = missing = 0
+    for text in skills:
+        for token in analyzer(text):
+            total += 1
+            missing += token not in vocabulary
+    return missing / total if total else 0.0
+
+
+def _load_frame(queryset, chunk_size=None):
+    """
+    The queryset's TRAINING_COLUMNS as a DataFrame, built column by column.
+    Rows come through values_list().iterator() (a server-side cursor on
+    PostgreSQL) one chunk at a time and are split into per-column arrays,
+    so the table is never also held as a list of row dicts.
+    """
+    chunk_size = chunk_size or getattr(settings, 'ML_STREAM_CHUNK_ROWS', 10000)
+    parts = {name: [] for name in TRAINING_COLUMNS}
+    rows = queryset.values_list(*TRAINING_COLUMNS).iterator(chunk_size=chunk_size)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            break
+        for name, values in zip(TRAINING_COLUMNS, zip(*batch)):
+            dtype = NUMERIC_COLUMNS.get(name, object)
+            parts[name].append(np.fromiter(values, dtype=dtype, count=len(batch)))
+        del batch
+
+    if not parts['id']:
+        return pd.DataFrame(columns=list(TRAINING_COLUMNS))
+    # One column at a time, letting go of its chunks as it is joined
+    return pd.DataFrame({name: np.concatenate(parts.pop(name)) for name in TRAINING_COLUMNS}, copy=False)
+
+
+def retrain_from_database(progress=None):
+    """
+    Fit a Predictor on every TrainingData row and publish it as a new
+    model bundle.
+
+    `progress(percent, stage, rows=None)` is called between steps so a background job
+    can report where it is. Returns a dict of metrics.
+    """
+    progress = progress or _noop_progress
+    started = time.perf_counter()
+
+    progress(5, "loading data")
+    df = _load_frame(TrainingData.objects.all())
+    if df.empty:
+        raise NoTrainingData("No data found to retrain")
+
+    # --- ML Training Logic ---
+    progress(20, "encoding features", rows=len(df))
+    predictor, metrics = fit_predictor(df, progress=progress)
+    metrics["mode"] = MODE_FULL
+    metrics["trainer"] = MODE_FULL
+    # Incremental retrains pick up from the newest row this model has seen.
+    # Ids come from a sequence, so a row still uncommitted while we load with
+    # a lower id than this would be skipped until the next full refit.
+    metrics["high_water_id"] = int(df['id'].max())
+    metrics["incremental_rounds"] = 0
+
+    # --- SAVE MODELS ---
+    progress(90, "publishing")
+    version = publish_bundle(predictor, metadata=metrics)
+
+    metrics["version"] = version
+    metrics["total_seconds"] = round(time.perf_counter() - started, 3)
+    progress(100, "done")
+    return metrics
+
+
+# ==========================================
+# Incremental retraining
+# ==========================================
+
+def _refit_reason(predictor, df):
+    """
+    Why the new rows can't be folded into the current model, or None.
+    The encoders and TF-IDF vocabulary stay frozen between full refits, so
+    anything they (or the classifier) have never seen forces a full refit.
+    """
+    metadata = predictor.metadata
+    preprocessor = predictor.preprocessor
+
+    if metadata.get("high_water_id") is None:
+        return "model has no high-water mark"
+    if not hasattr(predictor.model, 'estimators_'):
+        return "model does not support growing"
+    if metadata.get("n_estimators", 0) >= getattr(settings, 'ML_INCREMENTAL_MAX_ESTIMATORS', 300):
+        return "forest reached ML_INCREMENTAL_MAX_ESTIMATORS"
+
+    if not set(df['degree']).issubset(preprocessor._degree_codes):
+        return "new degree"
+    if not set(df['branch']).issubset(preprocessor._branch_codes):
+        return "new branch"
+    if not set(df['job_role']).issubset(predictor.classes_):
+        return "new job role"
+
+    baseline = metadata.get("skills_oov_share", 0.0)
+    margin = getattr(settings, 'ML_INCREMENTAL_OOV_MARGIN', 0.1)
+    if oov_share(preprocessor.tfidf, df['skills']) > baseline + margin:
+        return "new skills vocabulary"
+    return None
+
+
+def grow_predictor(predictor, df, progress=None):
+    """
+    Add ML_INCREMENTAL_ESTIMATORS trees fitted on `df` alone to the forest
+    (warm_start), reusing the fitted encoders and vocabulary. The old trees
+    are untouched, so the cost depends on len(df), not on the table size.
+    Mutates and returns `predictor` plus metrics for this round.
+    """
+    progress = progress or _noop_progress
+    preprocessor = predictor.preprocessor
+    clf = predictor.model
+
+    X = transform_features(
+        df['degree'], df['branch'], df['cgpa'], df['skills'],
+        preprocessor._degree_codes, preprocessor._branch_codes, preprocessor.tfidf,
+    )
+    y = df['job_role'].to_numpy(dtype=object)
+    sample_weight = np.ones(len(df))
+
+    # Every tree must know every class (the forest averages per-class
+    # probabilities), so roles missing from this batch get one zero-weight row
+    missing = np.setdiff1d(clf.classes_, y)
+    if len(missing):
+        X = sparse.vstack((X, sparse.csr_matrix((len(missing), X.shape[1]), dtype=X.dtype)), format='csr')
+        y = np.concatenate((y, missing.astype(object)))
+        sample_weight = np.concatenate((sample_weight, np.zeros(len(missing))))
+
+    progress(40, "growing model")
+    fit_started = time.perf_counter()
+    added = getattr(settings, 'ML_INCREMENTAL_ESTIMATORS', 10)
+    clf.set_params(
+        warm_start=True,
+        n_estimators=len(clf.estimators_) + added,
+        # A row-count max_samples from the full fit can exceed a small batch
+        max_samples=resolve_max_samples(getattr(settings, 'ML_RF_MAX_SAMPLES', None), X.shape[0]),
+    )
+    plan = fit_forest(clf, X, y, sample_weight=sample_weight)
+    clf.set_params(warm_start=False)
+    fit_seconds = time.perf_counter() - fit_started
+
+    progress(85, "evaluating")
+    rows = len(df)
+    metrics = {
+        "new_rows": rows,
+        "rows": predictor.metadata.get("rows", 0) + rows,
+        "n_features": int(X.shape[1]),
+        "n_classes": len(clf.classes_),
+        # On the new rows only; the old trees have never seen them
+        "train_accuracy": round(float(clf.score(X[:rows], y[:rows])), 4),
+        "fit_seconds": round(fit_seconds, 3),
+        "n_estimators": clf.n_estimators,
+        "n_jobs": plan["n_jobs"],
+        "backend": plan["backend"],
+        "skills_oov_share": predictor.metadata.get("skills_oov_share", 0.0),
+    }
+    return predictor, metrics
+
+
+def _up_to_date(predictor, current, high_water_id, started):
+    return {
+        "mode": "up_to_date",
+        "rows": 0,
+        "version": predictor.metadata.get("version", current),
+        "high_water_id": high_water_id,
+        "total_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def incremental_retrain(progress=None):
+    """
+    Fold TrainingData rows added since the current model's high-water mark
+    into it and publish the result: new trees for a forest, another
+    partial_fit pass for a streaming (SGD) model. Falls back to a full
+    refit of the same kind when there is no usable model or the new rows
+    bring unseen categories, roles or vocabulary.
+
+    Same `progress` callback and return value as retrain_from_database(),
+    plus "mode" ('incremental', 'full', 'streaming' or 'up_to_date').
+    """
+    progress = progress or _noop_progress
+    started = time.perf_counter()
+
+    progress(5, "loading model")
+    model_dir = default_model_dir()
+    current = read_current_version(model_dir)
+    try:
+        # A private copy from disk: the served predictor must never be mutated
+        predictor = load_bundle(resolve_version_dir(model_dir, current), current, model_format='joblib').predictor
+    except (OSError, TypeError, ValueError) as e:
+        print("Incremental Retrain: no usable model, doing a full refit:", e)
+        return retrain_from_database(progress=progress)
+
+    streaming = predictor.metadata.get("trainer") == MODE_STREAMING
+    full_refit = retrain_streaming if streaming else retrain_from_database
+
+    high_water_id = predictor.metadata.get("high_water_id")
+    if high_water_id is None:
+        print("Incremental Retrain: model has no high-water mark, doing a full refit")
+        return full_refit(progress=progress)
+
+    progress(10, "loading new data")
+    new_rows = TrainingData.objects.filter(id__gt=high_water_id)
+    if streaming:
+        # Only the new rows' categories are checked; the rows are streamed below
+        new_high_water_id = new_rows.aggregate(Max('id'))['id__max']
+        if new_high_water_id is None:
+            progress(100, "done")
+            return _up_to_date(predictor, current, high_water_id, started)
+        new_rows = new_rows.filter(id__lte=new_high_water_id).order_by('id')
+        reason = _streaming_refit_reason(predictor, new_rows)
+    else:
+        df = _load_frame(new_rows.order_by('id'))
+        if df.empty:
+            progress(100, "done")
+            return _up_to_date(predictor, current, high_water_id, started)
+        new_high_water_id = int(df['id'].max())
+        reason = _refit_reason(predictor, df)
+
+    if reason:
+        print(f"Incremental Retrain: {reason}, doing a full refit")
+        metrics = full_refit(progress=progress)
+        metrics["refit_reason"] = reason
+        return metrics
+
+    if streaming:
+        progress(20, "streaming new rows")
+        predictor, metrics = stream_predictor(predictor, new_rows, epochs=1, progress=progress)
+        metrics["new_rows"] = metrics["rows"]
+        metrics["rows"] += predictor.metadata.get("rows", 0)
+    else:
+        progress(20, "encoding features", rows=len(df))
+        predictor, metrics = grow_predictor(predictor, df, progress=progress)
+    metrics["mode"] = MODE_INCREMENTAL
+    metrics["high_water_id"] = new_high_water_id
+    metrics["incremental_rounds"] = predictor.metadata.get("incremental_rounds", 0) + 1
+    metrics["base_version"] = predictor.metadata.get("version", current)
+
+    progress(90, "publishing")
+    version = publish_bundle(predictor, metadata=metrics)
+
+    metrics["version"] = version
+    metrics["total_seconds"] = round(time.perf_counter() - started, 3)
+    progress(100, "done")
+    return metrics
+
+
+# ==========================================
+# Streaming (out-of-core) training
+# ==========================================
+
+def build_streaming_model():
+    """
+    Minibatch learner: MaxAbsScaler (keeps X sparse, brings degree/branch
+    codes and CGPA to the scale of the skill weights) + logistic-loss SGD,
+    so predict_proba works like the forest's.
+    """
+    return Pipeline([
+        ('scale', MaxAbsScaler()),
+        ('clf', SGDClassifier(
+            loss='log_loss',
+            alpha=getattr(settings, 'ML_SGD_ALPHA', 1e-5),
+            random_state=0,
+        )),
+    ])
+
+
+def stream_predictor(predictor, queryset, epochs=None, chunk_size=None, progress=None):
+    """
+    partial_fit predictor.model on `queryset`, one chunk at a time, for
+    `epochs` passes (each pass re-reads the rows from the database).
+    The encoders and class list on `predictor` must already cover every row.
+    Mutates and returns `predictor` plus metrics.
+    """
+    progress = progress or _noop_progress
+    epochs = epochs or getattr(settings, 'ML_STREAM_EPOCHS', 3)
+    preprocessor = predictor.preprocessor
+    scaler, clf = predictor.model.named_steps['scale'], predictor.model.named_steps['clf']
+    classes = np.array(predictor.metadata["classes"], dtype=object)
+    total = queryset.count()
+    rng = np.random.default_rng(0)
+
+    fit_started = time.perf_counter()
+    seen = scored = correct = 0
+    for epoch in range(epochs):
+        for chunk in iter_training_chunks(queryset, chunk_size):
+            X = transform_features(
+                chunk.degree, chunk.branch, chunk.cgpa, chunk.skills,
+                preprocessor._degree_codes, preprocessor._branch_codes, preprocessor.tfidf,
+            )
+            # Rows arrive in id order; shuffle within the chunk for SGD
+            order = rng.permutation(len(chunk))
+            X, y = X[order], chunk.job_role[order]
+
+            scaler.partial_fit(X)
+            X = scaler.transform(X)
+            if epoch == 0 and hasattr(clf, 'coef_'):
+                # Progressive validation: score each chunk before learning from it
+                correct += int((clf.predict(X) == y).sum())
+                scored += len(y)
+            clf.partial_fit(X, y, classes=classes)
+
+            seen += len(chunk)
+            progress(20 + int(65 * seen / max(total * epochs, 1)), f"training (epoch {epoch + 1}/{epochs})")
+
+    metrics = {
+        "rows": total,
+        "n_features": int(X.shape[1]) if seen else None,
+        "n_classes": len(classes),
+        "progressive_accuracy": round(correct / scored, 4) if scored else None,
+        "fit_seconds": round(time.perf_counter() - fit_started, 3),
+        "epochs": epochs,
+        "chunk_rows": chunk_size or getattr(settings, 'ML_STREAM_CHUNK_ROWS', 10000),
+    }
+    return predictor, metrics
+
+
+def _streaming_refit_reason(predictor, queryset):
+    """_refit_reason() for streaming models, from DISTINCT queries instead of a DataFrame."""
+    preprocessor = predictor.preprocessor
+    if not set(distinct_values(queryset, 'degree')).issubset(preprocessor._degree_codes):
+        return "new degree"
+    if not set(distinct_values(queryset, 'branch')).issubset(preprocessor._branch_codes):
+        return "new branch"
+    if not set(distinct_values(queryset, 'job_role')).issubset(predictor.classes_):
+        return "new job role"
+    return None
+
+
+def retrain_streaming(progress=None):
+    """
+    retrain_from_database() without loading the table: categories and
+    roles come from DISTINCT queries, skills are hashed (no vocabulary to
+    fit) and the rows are streamed through SGD partial_fit in chunks.
+    """
+    progress = progress or _noop_progress
+    started = time.perf_counter()
+
+    progress(5, "scanning categories")
+    # Pin the row set so rows inserted mid-training wait for the next retrain
+    high_water_id = TrainingData.objects.aggregate(Max('id'))['id__max']
+    if high_water_id is None:
+        raise NoTrainingData("No data found to retrain")
+    queryset = TrainingData.objects.filter(id__lte=high_water_id).order_by('id')
+
+    le_degree = LabelEncoder().fit(distinct_values(queryset, 'degree'))
+    le_branch = LabelEncoder().fit(distinct_values(queryset, 'branch'))
+    classes = distinct_values(queryset, 'job_role')
+    vectorizer = hashing_vectorizer(getattr(settings, 'ML_SKILLS_HASH_FEATURES', DEFAULT_HASH_FEATURES))
+    predictor = Predictor(build_streaming_model(), le_degree, le_branch, vectorizer,
+                          metadata={"classes": classes})
+
+    progress(20, "streaming rows")
+    predictor, metrics = stream_predictor(predictor, queryset, progress=progress)
+    metrics["mode"] = MODE_STREAMING
+    metrics["trainer"] = MODE_STREAMING
+    metrics["skills_encoder"] = 'hashing'
+    metrics["high_water_id"] = high_water_id
+    metrics["incremental_rounds"] = 0
+
+    progress(90, "publishing")
+    version = publish_bundle(predictor, metadata=metrics)
+
+    metrics["version"] = version
+    metrics["total_seconds"] = round(time.perf_counter() - started, 3)
+    progress(100, "done")
+    return metrics
+
+
+def retrain(mode=MODE_FULL, progress=None):
+    if mode == MODE_INCREMENTAL:
+        return incremental_retrain(progress=progress)
+    if mode == MODE_STREAMING:
+        return retrain_streaming(progress=progress)
+    return retrain_from_database(progress=progress)
@@ -3,10 +3,14 @@ from .views import (
     TrainingDataListView,
     upload_training_csv,
     retrain_model,
+    retrain_status,
     PredictJobView,
+    BatchPredictView,
+    model_status,
     UserPredictionHistoryView,
     # New Views
     GroupListCreateView,
+    group_membership,
     MessageListCreateView
 )
 
@@ -15,12 +19,16 @@ urlpatterns = [
     path('training-data/', TrainingDataListView.as_view(), name='training-data-list'),
     path('upload-csv/', upload_training_csv, name='upload-training-csv'),
     path('retrain/', retrain_model, name='retrain-model'),
+    path('retrain/<int:job_id>/', retrain_status, name='retrain-status'),
 
     # --- Student Prediction URLs ---
     path('predict/', PredictJobView.as_view(), name='predict-job'),
+    path('predict/batch/', BatchPredictView.as_view(), name='predict-batch'),
+    path('model/status/', model_status, name='model-status'),
     path('my-predictions/', UserPredictionHistoryView.as_view(), name='my-predictions'),
 
     # --- NEW CHAT URLs ---
     path('groups/', GroupListCreateView.as_view(), name='groups-list-create'),
+    path('groups/<int:group_id>/membership/', group_membership, name='group-membership'),
     path('messages/', MessageListCreateView.as_view(), name='messages-list-create'),
 ]
\ No newline at end of file
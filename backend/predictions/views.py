@@ -1,31 +1,43 @@
 from rest_framework import generics, status
 from rest_framework.views import APIView
-from rest_framework.decorators import api_view, permission_classes, parser_classes
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, parser_classes
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.pagination import CursorPagination
 
 # --- UPDATED IMPORTS (Included StudyGroup, GroupMessage & New Serializers) ---
-from .models import TrainingData, JobPrediction, StudyGroup, GroupMessage
+from .models import TrainingData, JobPrediction, StudyGroup, GroupMessage, GroupMembership, RetrainJob
 from .serializers import (
     TrainingDataSerializer, 
     CSVUploadSerializer, 
     JobPredictionSerializer,
     StudyGroupSerializer,      # New
-    GroupMessageSerializer     # New
+    GroupMessageSerializer,    # New
+    RetrainJobSerializer
 )
 
+from accounts.authentication import StatelessJWTAuthentication, user_from_claims
+from profiles.cache import get_profile_data
+
 # --- MODULE 2 INTEGRATION ---
-from .preprocessing import EducationPreprocessor
+from .registry import model_registry
+from .cache import prediction_cache, normalize_input, make_key
+from .jobs import enqueue_retrain
+from .writebehind import history_writer
+from .ingestion import ingest_training_csv, CSVFormatError
+from .signals import bulk_created
 
+import json
+import logging
 import pandas as pd
-import joblib
-import os
-import numpy as np
 from django.conf import settings
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import LabelEncoder
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import StreamingHttpResponse
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
 
 # ==========================================
 # 1. ADMIN VIEWS (Training Data & Retraining)
@@ -43,137 +55,120 @@ def upload_training_csv(request):
     """
     Robust CSV Upload:
     - FIX: Handles commas inside quotes (e.g., "Python, Java") using skipinitialspace.
+    - Streams the file in chunks (see predictions/ingestion.py), so memory
+      stays flat no matter how big the dataset is.
     """
     serializer = CSVUploadSerializer(data=request.data)
     if serializer.is_valid():
         file = request.FILES['file']
         try:
-            # FIX: skipinitialspace=True handles ' "Python' correctly
-            df = pd.read_csv(file, skipinitialspace=True, on_bad_lines='skip')
-            
-            # 1. Clean Column Names
-            df.columns = [c.strip().lower() for c in df.columns]
-
-            # 2. Check Missing Columns
-            required = ['degree', 'branch', 'cgpa', 'skills', 'job_role']
-            missing = [col for col in required if col not in df.columns]
-            
-            if missing:
-                return Response({
-                    "error": f"Missing required columns: {', '.join(missing)}"
-                }, status=400)
-
-            # 3. Handle Extra Columns
-            df = df[required]
-
-            # 4. Bulk Create
-            objs = [
-                TrainingData(
-                    degree=row['degree'],
-                    branch=row['branch'],
-                    cgpa=row['cgpa'],
-                    skills=row['skills'],
-                    job_role=row['job_role'],
-                    source='bulk_upload'
-                )
-                for _, row in df.iterrows()
-            ]
-            TrainingData.objects.bulk_create(objs)
-            
-            return Response({"message": f"Successfully added {len(objs)} records!"})
-            
+            report = ingest_training_csv(file)
+        except CSVFormatError as e:
+            return Response({"error": str(e)}, status=400)
         except Exception as e:
             return Response({"error": f"Error processing file: {str(e)}"}, status=500)
+
+        failed = report["failed"]
+        if failed:
+            # Earlier chunks are already committed; say exactly what was kept
+            return Response({
+                "error": (
+                    f"Added {report['accepted']} records, then chunk {failed['chunk']} "
+                    f"(from line {failed['first_line']}) failed: {failed['error']}. "
+                    f"Nothing from that line on was added."
+                ),
+                **report,
+            }, status=400)
+
+        return Response({
+            "message": f"Successfully added {report['accepted']} records!",
+            **report,
+        })
             
     return Response(serializer.errors, status=400)
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def retrain_model(request):
+    """
+    Queues a retrain instead of training inside the request.
+    The job is run by `python manage.py retrain_worker`.
+    Body {"mode": ...} picks how: "full" refits on every row (the default,
+    see ML_RETRAIN_DEFAULT_MODE); "incremental" only trains on rows added
+    since the current model; "streaming" trains out-of-core
+    (see predictions/training.py).
+    """
+    mode = request.data.get('mode')
+    if mode is not None and mode not in dict(RetrainJob.MODE_CHOICES):
+        return Response({"error": "mode must be 'full', 'incremental' or 'streaming'"}, status=400)
+    job, created = enqueue_retrain(user=request.user, mode=mode)
+    message = "Retraining queued." if created else "A retrain is already in progress."
+    return Response({
+        "message": message,
+        "job_id": job.id,
+        "status": job.status,
+        "mode": job.mode,
+    }, status=202)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def retrain_status(request, job_id):
     try:
-        data = TrainingData.objects.all().values()
-        if not data: return Response({"error": "No data found to retrain"}, status=400)
-        
-        df = pd.DataFrame(list(data))
-        
-        # --- ML Training Logic ---
-        le_degree = LabelEncoder()
-        df['degree_enc'] = le_degree.fit_transform(df['degree'])
-        
-        le_branch = LabelEncoder()
-        df['branch_enc'] = le_branch.fit_transform(df['branch'])
-        
-        vectorizer = TfidfVectorizer(max_features=50)
-        skills_vec = vectorizer.fit_transform(df['skills']).toarray()
-        
-        # Combine Features
-        X = np.hstack((df[['degree_enc', 'branch_enc', 'cgpa']].values, skills_vec))
-        y = df['job_role']
-        
-        # Train Random Forest
-        clf = RandomForestClassifier(n_estimators=100)
-        clf.fit(X, y)
-        
-        # --- SAVE MODELS ---
-        MODEL_DIR = os.path.join(settings.BASE_DIR, 'ml_models')
-        os.makedirs(MODEL_DIR, exist_ok=True)
-        
-        joblib.dump(clf, os.path.join(MODEL_DIR, 'career_model.pkl'))
-        joblib.dump(vectorizer, os.path.join(MODEL_DIR, 'tfidf.pkl'))      
-        joblib.dump(le_degree, os.path.join(MODEL_DIR, 'le_degree.pkl'))   
-        joblib.dump(le_branch, os.path.join(MODEL_DIR, 'le_branch.pkl'))   
-        
-        return Response({"message": "Model retrained successfully & saved!"})
-        
-    except Exception as e:
-        print("Retrain Error:", e)
-        return Response({"error": str(e)}, status=500)
+        job = RetrainJob.objects.get(pk=job_id)
+    except RetrainJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=404)
+    return Response(RetrainJobSerializer(job).data)
 
 # ==========================================
 # 2. STUDENT VIEWS (Prediction & History)
 # ==========================================
 
 class PredictJobView(APIView):
+    """
+    POST {highest_degree, branch, cgpa, skills} -> predicted role.
+    POST {"use_profile": true} predicts from the caller's saved profile
+    (read through profiles/cache.py), so the client needs no GET /profile/me/ first.
+    """
+    # Claims-only auth: no accounts.User query per prediction
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Load Model
-        model_path = os.path.join(settings.BASE_DIR, 'ml_models', 'career_model.pkl')
+    def post(self, request):
+        # Shared, already-loaded artifacts (loaded once per worker process)
         try:
-            self.model = joblib.load(model_path)
-            self.preprocessor = EducationPreprocessor()
+            bundle = model_registry.get()
         except Exception as e:
             print("Model Load Error:", e)
-            self.model = None
-
-    def post(self, request):
-        if not self.model:
             return Response({"error": "ML Model not loaded. Contact Admin."}, status=503)
 
+        predictor = bundle.predictor
+
         data = request.data
-        user = request.user
+        user_id = request.user.id
+
+        if data.get('use_profile') in (True, 'true', '1', 1):
+            data = predictor.profile_record(get_profile_data(user_id))
+            if not data['highest_degree'] or not data['skills']:
+                return Response(
+                    {"error": "Please update your profile with Degree and Skills before predicting."},
+                    status=400,
+                )
 
         # Validation
-        is_valid, message = self.preprocessor.validate_input(data)
+        is_valid, message = predictor.validate(data)
         if not is_valid:
             return Response({"error": message}, status=400)
 
         try:
-            # Preprocessing
-            final_features = self.preprocessor.preprocess(data)
+            # Same (degree, branch, cgpa, skills) -> same answer; skip the forest on a hit
+            features = normalize_input(data)
+            cache_key = make_key(features)
+            top_matches = prediction_cache.get(cache_key, bundle.version)
 
-            # Prediction
-            probabilities = self.model.predict_proba(final_features)[0]
-            top3_indices = np.argsort(probabilities)[-3:][::-1]
-            classes = self.model.classes_
-            
-            top_matches = []
-            for index in top3_indices:
-                role = classes[index]
-                score = probabilities[index] * 100
-                if score > 0:
-                    top_matches.append({"role": role, "score": round(score, 2)})
+            if top_matches is None:
+                # Preprocessing + Prediction (one Predictor, see predictions/predictor.py)
+                top_matches = predictor.predict_top([features])[0]
+                prediction_cache.set(cache_key, bundle.version, top_matches)
 
             if not top_matches:
                  return Response({"error": "Could not determine a suitable role."}, status=400)
@@ -181,16 +176,16 @@ class PredictJobView(APIView):
             best_match = top_matches[0]['role']
             best_score = top_matches[0]['score']
 
-            # Save History
-            JobPrediction.objects.create(
-                user=user,
+            # Save History (queued; written in bulk off the request path)
+            history_writer.submit(JobPrediction(
+                user_id=user_id,
                 highest_degree=data.get('highest_degree'),
                 branch=data.get('branch'),
                 cgpa=data.get('cgpa'),
                 skills=data.get('skills'),
                 predicted_role=best_match,
                 confidence_score=best_score
-            )
+            ))
 
             return Response({
                 "predicted_role": best_match,
@@ -202,45 +197,254 @@ class PredictJobView(APIView):
             print("Prediction Logic Error:", e)
             return Response({"error": "Prediction failed internally."}, status=500)
 
+class BatchPredictView(APIView):
+    """
+    POST a JSON array of profiles (or {"profiles": [...]}) or a CSV file
+    with highest_degree/degree, branch, cgpa, skills (+ optional email).
+
+    Rows are processed in chunks of ML_BATCH_CHUNK_ROWS: one vectorized
+    transform, one predict_proba and one bulk_create per chunk, and each
+    chunk's results are streamed back (one JSON object per line) before the
+    next is predicted. The last line is {"done": true, "predictions": n, "errors": m}.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def _read_records(self, request, max_rows):
+        upload = request.FILES.get('file')
+        if upload is not None:
+            # One row past the limit is enough to reject the batch, so a huge
+            # file is never parsed in full
+            df = pd.read_csv(upload, skipinitialspace=True, on_bad_lines='skip', dtype=str, nrows=max_rows + 1)
+            df.columns = [c.strip().lower() for c in df.columns]
+            if 'highest_degree' not in df.columns and 'degree' in df.columns:
+                df = df.rename(columns={'degree': 'highest_degree'})
+            return df.fillna('').to_dict('records')
+
+        data = request.data
+        if isinstance(data, dict):
+            data = data.get('profiles')
+        return data if isinstance(data, list) else None
+
+    def post(self, request):
+        try:
+            bundle = model_registry.get()
+        except Exception as e:
+            print("Model Load Error:", e)
+            return Response({"error": "ML Model not loaded. Contact Admin."}, status=503)
+
+        max_rows = getattr(settings, 'ML_BATCH_MAX_ROWS', 5000)
+        try:
+            records = self._read_records(request, max_rows)
+        except Exception as e:
+            return Response({"error": f"Error processing file: {str(e)}"}, status=400)
+
+        if not records:
+            return Response({"error": "Send a JSON array of profiles or a CSV file."}, status=400)
+
+        if len(records) > max_rows:
+            return Response({"error": f"Batch too large: more than {max_rows} rows."}, status=400)
+
+        predictor = bundle.predictor
+        user = request.user
+        chunk_rows = getattr(settings, 'ML_BATCH_CHUNK_ROWS', 500)
+
+        def stream():
+            # Predict, save and write one chunk at a time, so output starts
+            # after the first chunk and only one chunk of results is held
+            predicted = 0
+            for start in range(0, len(records), chunk_rows):
+                chunk = records[start:start + chunk_rows]
+                try:
+                    results, errors = self._predict_chunk(predictor, chunk, user)
+                except Exception as e:
+                    print("Batch Prediction Error:", e)
+                    results, errors = {}, dict.fromkeys(range(len(chunk)), "Prediction failed.")
+                for offset in range(len(chunk)):
+                    if offset in results:
+                        line = {"index": start + offset, **results[offset]}
+                    else:
+                        line = {"index": start + offset, "error": errors.get(offset, "Invalid input.")}
+                    yield json.dumps(line) + "\n"
+                predicted += len(results)
+            # Counts are only known at the end, so they come as a last line
+            yield json.dumps({"done": True, "predictions": predicted, "errors": len(records) - predicted}) + "\n"
+
+        return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+    def _predict_chunk(self, predictor, records, user):
+        """(results, errors) for one chunk, keyed by position in `records`."""
+        valid_indices, errors = predictor.preprocessor.validate_many(records)
+        valid_records = [records[i] for i in valid_indices]
+        results = {}
+        if not valid_records:
+            return results, errors
+
+        # One vectorized transform + one predict_proba for the whole chunk
+        ranked = predictor.predict_top(valid_records)
+
+        # Optional email column -> attribute history to that student
+        emails = {r.get('email') for r in valid_records if r.get('email')}
+        users_by_email = {u.email: u for u in User.objects.filter(email__in=emails)} if emails else {}
+
+        history = []
+        for row, index in enumerate(valid_indices):
+            record = records[index]
+            top_matches = ranked[row]
+            if not top_matches:
+                errors[index] = "Could not determine a suitable role."
+                continue
+
+            results[index] = {
+                "predicted_role": top_matches[0]['role'],
+                "confidence_score": top_matches[0]['score'],
+                "alternatives": top_matches[1:],
+            }
+            history.append(JobPrediction(
+                user=users_by_email.get(record.get('email'), user),
+                highest_degree=record.get('highest_degree'),
+                branch=record.get('branch'),
+                cgpa=float(record.get('cgpa')),
+                skills=record.get('skills'),
+                predicted_role=top_matches[0]['role'],
+                confidence_score=top_matches[0]['score'],
+            ))
+
+        JobPrediction.objects.bulk_create(history, batch_size=1000)
+        # Rows are committed; a failing listener (rollups, buckets) must not
+        # turn them into "Prediction failed." lines
+        for receiver, result in bulk_created.send_robust(sender=JobPrediction, objs=history):
+            if isinstance(result, Exception):
+                logger.error("bulk_created listener %s failed: %s", receiver, result)
+        return results, errors
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def model_status(request):
+    """Load time, memory footprint and cache counters for this worker."""
+    return Response({
+        **model_registry.stats(),
+        "prediction_cache": prediction_cache.stats(),
+        "history_writer": history_writer.stats(),
+    })
+
 class UserPredictionHistoryView(generics.ListAPIView):
     serializer_class = JobPredictionSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return JobPrediction.objects.filter(user=self.request.user).order_by('-created_at')
+        # Dashboards read this right after predicting: write this worker's
+        # pending history first (other workers' rows lag by ML_HISTORY_FLUSH_MS)
+        history_writer.flush()
+        return JobPrediction.objects.filter(user_id=self.request.user.id).order_by('-created_at')
 
 # ==========================================
 # 3. CHAT & GROUPS VIEWS (NEWLY ADDED)
 # ==========================================
 
+class GroupCursorPagination(CursorPagination):
+    # Keyset pages on the (-created_at, -id) index; no COUNT(*) per poll
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+
 class GroupListCreateView(generics.ListCreateAPIView):
     """
-    GET: Returns list of all study groups.
-    POST: Creates a new study group.
+    GET: Returns study groups, newest first, in pages of 50
+         ({"results", "next", "previous"}; follow "next" for more).
+         Member/message counts are stored columns, so this is one query.
+    POST: Creates a new study group (the creator becomes its first member).
     """
-    queryset = StudyGroup.objects.all().order_by('-created_at')
+    queryset = StudyGroup.objects.all()
     serializer_class = StudyGroupSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = GroupCursorPagination
 
     def perform_create(self, serializer):
         # Automatically set the creator as the logged-in user
-        serializer.save(created_by=self.request.user)
+        with transaction.atomic():
+            group = serializer.save(created_by=user_from_claims(self.request.user))
+        # Counters were bumped by signals after the instance was built
+        group.refresh_from_db(fields=['members_count', 'messages_count', 'last_activity_at'])
+
+
+@api_view(['POST', 'DELETE'])
+@authentication_classes([StatelessJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def group_membership(request, group_id):
+    """POST joins the group, DELETE leaves it. Returns the updated counters."""
+    if not StudyGroup.objects.filter(pk=group_id).exists():
+        return Response({"error": "Group not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    with transaction.atomic():
+        if request.method == 'POST':
+            GroupMembership.objects.get_or_create(group_id=group_id, user_id=request.user.id)
+        else:
+            # Per-object delete so the post_delete counter signal fires
+            for membership in GroupMembership.objects.filter(group_id=group_id, user_id=request.user.id):
+                membership.delete()
+
+    group = StudyGroup.objects.get(pk=group_id)
+    return Response(StudyGroupSerializer(group).data)
 
 class MessageListCreateView(generics.ListCreateAPIView):
     """
     GET: Returns messages for a specific group (?group_id=1).
+         Add ?since_id=<last seen id> to get only newer messages.
+         Sends an ETag; a repeat poll with If-None-Match gets 304 when nothing changed.
     POST: Sends a message to a specific group.
     """
     serializer_class = GroupMessageSerializer
+    # Polled every 2 seconds: authenticate from token claims, no user query
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def _since_id(self):
+        try:
+            return int(self.request.query_params.get('since_id', 0))
+        except ValueError:
+            return 0
+
     def get_queryset(self):
         # Filter messages by Group ID passed in URL
         group_id = self.request.query_params.get('group_id')
-        if group_id:
-            return GroupMessage.objects.filter(group_id=group_id).order_by('created_at')
-        return GroupMessage.objects.none()
+        if not group_id:
+            return GroupMessage.objects.none()
+
+        # select_related: username comes from the same query, not one query per message
+        queryset = GroupMessage.objects.filter(group_id=group_id).select_related('user').order_by('id')
+        since_id = self._since_id()
+        if since_id:
+            queryset = queryset.filter(id__gt=since_id)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        group_id = request.query_params.get('group_id')
+        if not group_id:
+            return super().list(request, *args, **kwargs)
+
+        # Newest id in the group: one lookup on the (group, id) index
+        latest_id = (
+            GroupMessage.objects.filter(group_id=group_id)
+            .order_by('-id').values_list('id', flat=True).first()
+        ) or 0
+        etag = f'"{group_id}-{self._since_id()}-{latest_id}"'
+
+        if request.headers.get('If-None-Match') == etag:
+            response = Response(status=304)
+        else:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
     def perform_create(self, serializer):
-        # Automatically set the sender as the logged-in user
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        # Automatically set the sender as the logged-in user (built from the
+        # token claims, so the response/push serializer needs no user query);
+        # the message and the group counter updates commit together
+        with transaction.atomic():
+            serializer.save(user=user_from_claims(self.request.user))
@@ -0,0 +1,239 @@
+# backend/predictions/writebehind.py
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import JobPrediction
+from .signals import bulk_created
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Queues unsaved model instances in-process and writes them with
+    bulk_create from a background thread, every `max_batch` records or
+    every `flush_ms` milliseconds, whichever comes first.
+
+    The request that produced the row returns without waiting for the
+    INSERT, so a row shows up in queries (e.g. /api/my-predictions/) up to
+    about `flush_ms` (ML_HISTORY_FLUSH_MS) plus one INSERT later; call
+    flush() first to read your own writes. Remaining rows are flushed at
+    interpreter exit. If the queue is full (database down or too slow),
+    submit() falls back to a synchronous save. A failed bulk INSERT is
+    retried once, then saved row by row, so one bad row or a dropped
+    connection does not lose the whole batch.
+    """
+
+    def __init__(self, model, max_batch=None, flush_ms=None, max_queue=None):
+        self.model = model
+        self._max_batch = max_batch
+        self._flush_ms = flush_ms
+        self._max_queue = max_queue
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._atexit_registered = False
+
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.sync_fallbacks = 0
+        self.flushes = 0
+        self.last_flush_ms = None
+        self.last_error = None
+
+    # --- Configuration ---
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'ML_HISTORY_WRITE_BEHIND', True)
+
+    @property
+    def max_batch(self):
+        return self._max_batch or getattr(settings, 'ML_HISTORY_FLUSH_ROWS', 200)
+
+    @property
+    def flush_ms(self):
+        return self._flush_ms or getattr(settings, 'ML_HISTORY_FLUSH_MS', 500)
+
+    @property
+    def max_queue(self):
+        return self._max_queue or getattr(settings, 'ML_HISTORY_MAX_QUEUE', 10000)
+
+    # --- Producer side ---
+
+    def submit(self, obj):
+        if not self.enabled:
+            obj.save()
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(obj)
+            self.submitted += 1
+        except queue.Full:
+            self.sync_fallbacks += 1
+            obj.save()
+
+    def _ensure_started(self):
+        # Lazily start per process: gunicorn forks workers after import,
+        # and threads do not survive a fork.
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='history-write-behind', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    # --- Consumer side ---
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+        # Drain whatever arrived before stop()
+        self.flush()
+
+    def _collect(self):
+        """Block for the first item, then gather more until the batch or time limit."""
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_ms / 1000
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        try:
+            bulk, saved = self._insert(batch)
+        finally:
+            self.flushes += 1
+            self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+            # Every row came off the queue; lets flush() know the batch is done
+            for _ in batch:
+                self._queue.task_done()
+
+        # Rows saved one by one already fired post_save; only bulk_create
+        # rows need the signal, or the rollups would count them twice.
+        # Rows are in; a failing listener (e.g. analytics rollups) must not count them as lost
+        if bulk:
+            for receiver, result in bulk_created.send_robust(sender=self.model, objs=bulk):
+                if isinstance(result, Exception):
+                    logger.error("bulk_created listener %s failed: %s", receiver, result)
+
+    def _insert(self, batch):
+        """
+        bulk_create, retried once, then row by row.
+        Returns (rows written by bulk_create, rows saved individually).
+        """
+        for attempt in (1, 2):
+            try:
+                close_old_connections()
+                self.model.objects.bulk_create(batch, batch_size=self.max_batch)
+                self.written += len(batch)
+                self.last_error = None
+                return batch, []
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning("History bulk insert of %d rows failed (attempt %d): %s", len(batch), attempt, e)
+
+        saved = []
+        close_old_connections()
+        for obj in batch:
+            try:
+                obj.save()
+                saved.append(obj)
+            except Exception as e:
+                self.failed += 1
+                self.last_error = str(e)
+                logger.exception("History row dropped after retries: %s", e)
+        self.written += len(saved)
+        return [], saved
+
+    def _wait_idle(self, timeout):
+        """Wait until every queued row, including the worker's in-flight batch, is written."""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def flush(self, timeout=5.0):
+        """
+        Write everything submitted so far and wait for it (safe from any
+        thread). Returns False if the worker's batch is still not written
+        after `timeout` seconds.
+        """
+        if self._queue is None:
+            return True
+        batch = self._drain()
+        while batch:
+            self._write(batch[:self.max_batch])
+            batch = batch[self.max_batch:]
+        return self._wait_idle(timeout)
+
+    def stop(self, timeout=5.0):
+        """Stop the worker thread and flush the rest; registered with atexit."""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": bool(self._thread and self._thread.is_alive() and self._pid == os.getpid()),
+            "submitted": self.submitted,
+            "written": self.written,
+            "failed": self.failed,
+            "sync_fallbacks": self.sync_fallbacks,
+            "flushes": self.flushes,
+            "last_flush_ms": self.last_flush_ms,
+            "last_error": self.last_error,
+        }
+
+
+# Process-wide buffer for JobPrediction history rows
+history_writer = WriteBehindBuffer(JobPrediction)
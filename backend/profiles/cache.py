@@ -0,0 +1,47 @@
+# backend/profiles/cache.py
+#
+# Read-through cache of serialized profiles, keyed by user id.
+# Uses Django's cache (CACHES in settings.py). profiles/signals.py drops the
+# entry whenever a UserProfile is saved or deleted.
+#
+# Only on when the cache is shared (PROFILE_CACHE_ENABLED, on by default with
+# CACHE_URL): with the per-process LocMemCache a save would only evict the
+# entry in the worker that handled it, and the others would keep serving the
+# old profile (and predictions from it) until the TTL ran out.
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import UserProfile
+from .serializers import UserProfileSerializer
+
+KEY_PREFIX = 'profile:v1:'
+
+# Fields the prediction model reads from a profile
+PREDICTION_FIELDS = ('highest_degree', 'branch', 'cgpa', 'skills')
+
+
+def cache_key(user_id):
+    return f"{KEY_PREFIX}{user_id}"
+
+
+def get_profile_data(user_id):
+    """Serialized profile for the user (created empty on first access)."""
+    if not getattr(settings, 'PROFILE_CACHE_ENABLED', False):
+        return _load(user_id)
+
+    key = cache_key(user_id)
+    data = cache.get(key)
+    if data is None:
+        data = _load(user_id)
+        cache.set(key, data, getattr(settings, 'PROFILE_CACHE_TTL', 300))
+    return data
+
+
+def _load(user_id):
+    profile, created = UserProfile.objects.get_or_create(user_id=user_id)
+    return dict(UserProfileSerializer(profile).data)
+
+
+def invalidate(user_id):
+    cache.delete(cache_key(user_id))
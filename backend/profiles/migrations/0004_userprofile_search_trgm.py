@@ -0,0 +1,40 @@
+# Trigram indexes for the admin user search (college/skills icontains).
+# PostgreSQL only; other databases skip this migration's SQL.
+
+from django.db import migrations
+
+# Django compiles `field__icontains` on PostgreSQL to UPPER("col"::text) LIKE UPPER(...),
+# so the index has to be on that exact expression to be usable.
+INDEXES = {
+    'profiles_userprofile_college_trgm': 'college',
+    'profiles_userprofile_skills_trgm': 'skills',
+}
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON profiles_userprofile '
+            f'USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_userprofile_recruitment_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
@@ -1,10 +1,20 @@
 from rest_framework import generics
+from rest_framework.response import Response
+
+from accounts.authentication import StatelessJWTAuthentication
+
+from .cache import get_profile_data
 from .models import UserProfile
 from .serializers import UserProfileSerializer
 
 class MyProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
+    authentication_classes = [StatelessJWTAuthentication]
 
     def get_object(self):
-        profile, created = UserProfile.objects.get_or_create(user=self.request.user)
+        profile, created = UserProfile.objects.get_or_create(user_id=self.request.user.id)
         return profile
+
+    def retrieve(self, request, *args, **kwargs):
+        # Read-through cache (profiles/cache.py); saves invalidate it
+        return Response(get_profile_data(request.user.id))
@@ -1,13 +1,32 @@
 # train_model.py
+#
+# CLI trainer. Uses the same code as /api/retrain/ (predictions/training.py)
+# and publishes one Predictor bundle that the API picks up without a restart.
+#
+#   python train_model.py                 # train on the TrainingData table
+#   python train_model.py --incremental   # only the rows added since the current model
+#   python train_model.py --streaming     # out-of-core: hashed skills + SGD, table read in chunks
+#   python train_model.py data.csv        # train on a CSV (degree, branch, cgpa, skills, job_role)
+#   python train_model.py --demo          # train on the small built-in dataset
+import os
+import sys
+
+import django
 import pandas as pd
-import numpy as np
-import joblib
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import LabelEncoder
 
-# 1. Create Dummy Data (Education + Skills -> Job Role)
-data = {
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edu2job_backend.settings')
+django.setup()
+
+from predictions.registry import publish_bundle  # noqa: E402
+from predictions.training import (  # noqa: E402
+    fit_predictor,
+    incremental_retrain,
+    retrain_from_database,
+    retrain_streaming,
+)
+
+# Small demo dataset (Education + Skills -> Job Role)
+DEMO_DATA = {
     'degree': ['B.Tech', 'B.Tech', 'B.Sc', 'MCA', 'B.Tech', 'M.Tech', 'B.Tech', 'B.Com'],
     'branch': ['CSE', 'ECE', 'Maths', 'Computer Applications', 'Mechanical', 'CSE', 'Civil', 'Commerce'],
     'cgpa': [8.5, 7.2, 9.0, 7.8, 6.5, 8.8, 7.0, 8.0],
@@ -33,44 +52,29 @@ data = {
     ]
 }
 
-# Convert to DataFrame
-df = pd.DataFrame(data)
-
-# 2. Preprocessing
-# A. Encode Categorical Data (Degree, Branch)
-le_degree = LabelEncoder()
-df['degree_enc'] = le_degree.fit_transform(df['degree'])
 
-le_branch = LabelEncoder()
-df['branch_enc'] = le_branch.fit_transform(df['branch'])
+def main(args):
+    if not args:
+        print("Training on TrainingData table...")
+        metrics = retrain_from_database()
+    elif args[0] == '--incremental':
+        print("Training on new TrainingData rows...")
+        metrics = incremental_retrain()
+    elif args[0] == '--streaming':
+        print("Streaming TrainingData table...")
+        metrics = retrain_streaming()
+    else:
+        if args[0] == '--demo':
+            df = pd.DataFrame(DEMO_DATA)
+        else:
+            df = pd.read_csv(args[0], skipinitialspace=True)
+            df.columns = [c.strip().lower() for c in df.columns]
+        print(f"Training on {len(df)} rows...")
+        predictor, metrics = fit_predictor(df)
+        metrics["version"] = publish_bundle(predictor, metadata=metrics)
 
-# B. Vectorize Skills (Text -> Numbers)
-vectorizer = TfidfVectorizer(max_features=50) # Taking top 50 words
-skills_matrix = vectorizer.fit_transform(df['skills']).toarray()
-
-# C. Combine Features (Degree + Branch + CGPA + Skills Vector)
-# Inputs (X)
-X = np.hstack((
-    df[['degree_enc', 'branch_enc', 'cgpa']].values, 
-    skills_matrix
-))
-
-# Target (Y)
-y = df['job_role']
-
-# 3. Train Model
-clf = RandomForestClassifier(n_estimators=100, random_state=42)
-clf.fit(X, y)
-
-# 4. Save Everything (Serialization)
-import os
-if not os.path.exists('ml_models'):
-    os.makedirs('ml_models')
+    print(f"✅ Model Trained & Published as version {metrics['version']}: {metrics}")
 
-print("Saving models...")
-joblib.dump(clf, 'ml_models/job_model.pkl')
-joblib.dump(vectorizer, 'ml_models/skills_vectorizer.pkl')
-joblib.dump(le_degree, 'ml_models/degree_encoder.pkl')
-joblib.dump(le_branch, 'ml_models/branch_encoder.pkl')
 
-print("✅ Model Trained & Saved in 'ml_models/' folder!")
\ No newline at end of file
+if __name__ == '__main__':
+    main(sys.argv[1:])
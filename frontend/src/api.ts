@@ -14,4 +14,9 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// WebSocket origin of the same backend (https -> wss, without /api)
+export const wsBaseURL = (api.defaults.baseURL || "")
+  .replace(/^http/, "ws")
+  .replace(/\/api\/?$/, "");
+
 export default api;
\ No newline at end of file
@@ -56,8 +56,26 @@ const AdminTrainingDataPage: React.FC = () => {
     setRetraining(true);
     setMsg(null);
     try {
+      // Backend queues the job & returns immediately, so poll its status
       const res = await api.post("/retrain/");
-      setMsg({ type: "success", text: `Success! ${res.data.message}` });
+      const jobId = res.data.job_id;
+      setMsg({ type: "success", text: `${res.data.message} (Job #${jobId})` });
+
+      while (true) {
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+        const statusRes = await api.get(`/retrain/${jobId}/`);
+        const job = statusRes.data;
+
+        if (job.status === "SUCCEEDED") {
+          setMsg({ type: "success", text: `Success! Model retrained on ${job.row_count} rows in ${job.elapsed_seconds}s.` });
+          break;
+        }
+        if (job.status === "FAILED") {
+          setMsg({ type: "error", text: `Retraining failed: ${job.error}` });
+          break;
+        }
+        setMsg({ type: "success", text: `Retraining... ${job.progress}% (${job.stage || job.status})` });
+      }
     } catch (err) {
       setMsg({ type: "error", text: "Retraining failed." });
     } finally {
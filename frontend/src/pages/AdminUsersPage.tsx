@@ -6,6 +6,7 @@ import { Search, Filter, CheckCircle, XCircle, Loader2, Download } from "lucide-
 const AdminUsersPage: React.FC = () => {
   const [users, setUsers] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   
   // Filters State
   const [filters, setFilters] = useState({
@@ -15,8 +16,8 @@ const AdminUsersPage: React.FC = () => {
     status: "", // PENDING, SHORTLISTED, REJECTED
   });
 
-  // Fetch Users
-  const fetchUsers = async () => {
+  // Fetch Users (cursor = null -> first page, otherwise append next page)
+  const fetchUsers = async (cursor: string | null = null) => {
     setLoading(true);
     try {
       // Build Query String
@@ -25,9 +26,11 @@ const AdminUsersPage: React.FC = () => {
       if (filters.college) params.append("college", filters.college);
       if (filters.skill) params.append("skill", filters.skill);
       if (filters.status) params.append("status", filters.status);
+      if (cursor) params.append("cursor", cursor);
 
       const res = await api.get(`/adminpanel/users/?${params.toString()}`);
-      setUsers(res.data);
+      setUsers(prev => cursor ? [...prev, ...res.data.results] : res.data.results);
+      setNextCursor(res.data.next_cursor);
     } catch (err) {
       console.error("Failed to fetch users", err);
     } finally {
@@ -175,6 +178,17 @@ const AdminUsersPage: React.FC = () => {
               </tbody>
             </table>
           )}
+          {nextCursor && (
+            <div style={{ padding: "15px", textAlign: "center" }}>
+              <button
+                onClick={() => fetchUsers(nextCursor)}
+                disabled={loading}
+                style={{ background: "white", border: "1px solid #d1d5db", padding: "10px 15px", borderRadius: "8px", cursor: "pointer" }}
+              >
+                Load More
+              </button>
+            </div>
+          )}
         </div>
 
       </div>
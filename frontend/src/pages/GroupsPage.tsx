@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef } from "react";
 import DashboardLayout from "../components/DashboardLayout";
-import api from "../api"; 
+import api, { wsBaseURL } from "../api"; 
 import { useAuth } from "../auth/useAuth";
 import { Users, Send, PlusCircle, X, Search, Loader2, MessageSquare } from "lucide-react";
 
@@ -10,6 +10,8 @@ interface Group {
   name: string;
   description: string;
   members_count: number;
+  messages_count: number;
+  last_activity_at: string | null;
 }
 
 interface Message {
@@ -35,6 +37,8 @@ const GroupsPage: React.FC = () => {
   const [newGroupDesc, setNewGroupDesc] = useState("");
 
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  // Id of the newest message we have, so polls only ask for newer ones
+  const lastMessageIdRef = useRef<number>(0);
 
   // --- 1. FETCH GROUPS & AUTO REFRESH (Every 5 Seconds) ---
   useEffect(() => {
@@ -50,35 +54,88 @@ const GroupsPage: React.FC = () => {
   const fetchGroups = async () => {
     try {
       const res = await api.get("/groups/");
+      // Paginated: {results, next, previous} - first page holds the 50 newest groups
       // Note: In a real app, compare data before setting state to avoid re-renders
-      setGroups(res.data);
+      setGroups(res.data.results ?? res.data);
     } catch (err) {
       console.error("Error loading groups", err);
     }
   };
 
-  // --- 2. FETCH MESSAGES & AUTO REFRESH (Every 2 Seconds) ---
+  // --- 2. FETCH MESSAGES, THEN LIVE UPDATES ---
+  // Preferred: WebSocket push (/ws/groups/<id>/). Fallback: poll every 2 seconds.
   useEffect(() => {
     let interval: any;
+    let socket: WebSocket | null = null;
+    let closedByUs = false;
+
+    const startPolling = () => {
+      if (interval || !activeGroup) return;
+      interval = setInterval(() => {
+        fetchMessages(activeGroup.id, true); // 'true' means silent update (no loader)
+      }, 2000);
+    };
+
+    const stopPolling = () => {
+      clearInterval(interval);
+      interval = null;
+    };
 
     if (activeGroup) {
+      lastMessageIdRef.current = 0;
       setLoadingMessages(true);
       fetchMessages(activeGroup.id); // Immediate load
 
-      // POLL: Check for new messages every 2 seconds
-      interval = setInterval(() => {
-        fetchMessages(activeGroup.id, true); // 'true' means silent update (no loader)
-      }, 2000);
+      const token = localStorage.getItem("access");
+      if (token && wsBaseURL && typeof WebSocket !== "undefined") {
+        socket = new WebSocket(`${wsBaseURL}/ws/groups/${activeGroup.id}/?token=${encodeURIComponent(token)}`);
+
+        socket.onopen = () => {
+          stopPolling();
+          // Catch anything sent between the initial load and the socket opening
+          fetchMessages(activeGroup.id, true);
+        };
+
+        socket.onmessage = (event) => {
+          const message: Message = JSON.parse(event.data);
+          if (message.id > lastMessageIdRef.current) {
+            lastMessageIdRef.current = message.id;
+            setMessages(prev => [...prev, message]);
+          }
+        };
+
+        socket.onclose = () => {
+          if (!closedByUs) startPolling();
+        };
+      } else {
+        startPolling();
+      }
     }
 
-    return () => clearInterval(interval); // Stop polling when group changes
+    return () => {
+      closedByUs = true;
+      socket?.close();
+      stopPolling(); // Stop polling when group changes
+    };
   }, [activeGroup]); // Re-run when activeGroup changes
 
   const fetchMessages = async (groupId: number, silent = false) => {
     if (!silent) setLoadingMessages(true);
     try {
-      const res = await api.get(`/messages/?group_id=${groupId}`);
-      setMessages(res.data);
+      // Initial load: full history. Polls: only messages after the last one we have.
+      const sinceId = silent ? lastMessageIdRef.current : 0;
+      const res = await api.get(`/messages/?group_id=${groupId}&since_id=${sinceId}`);
+      const incoming: Message[] = res.data;
+
+      if (!sinceId) {
+        setMessages(incoming);
+      } else {
+        const fresh = incoming.filter(m => m.id > lastMessageIdRef.current);
+        if (fresh.length > 0) setMessages(prev => [...prev, ...fresh]);
+      }
+      if (incoming.length > 0) {
+        lastMessageIdRef.current = Math.max(lastMessageIdRef.current, incoming[incoming.length - 1].id);
+      }
       // Only scroll to bottom on initial load or if user sends a message
       if (!silent) scrollToBottom();
     } catch (err) {
@@ -17,30 +17,15 @@ const JobPredictionPage: React.FC = () => {
     setResult(null);
 
     try {
-      // 1. Get User Profile Data
-      const profileRes = await api.get("/profile/me/");
-      const profile = profileRes.data;
-
-      // Validation: Check if basic fields are filled
-      if (!profile.highest_degree || !profile.skills) {
-        setError("Please update your profile with Degree and Skills before predicting.");
-        setLoading(false);
-        return;
-      }
-
-      // 2. Send to ML Model
-      const res = await api.post("/predict/", {
-        highest_degree: profile.highest_degree,
-        branch: profile.branch,
-        cgpa: profile.cgpa,
-        skills: profile.skills
-      });
+      // Predict straight from the saved profile (one round trip; the
+      // backend answers 400 if Degree/Skills are missing)
+      const res = await api.post("/predict/", { use_profile: true });
 
       setResult(res.data);
 
-    } catch (err) {
+    } catch (err: any) {
       console.error(err);
-      setError("Prediction failed. Please try again later.");
+      setError(err.response?.data?.error || "Prediction failed. Please try again later.");
     } finally {
       setLoading(false);
     }